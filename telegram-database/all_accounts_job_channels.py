@@ -5,10 +5,35 @@ All Accounts Job Channels CSV Generator
 """
 
 import csv
-import json
 import sqlite3
 from datetime import datetime
-from typing import List, Dict, Any
+from itertools import chain
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+# Column order of the exported job channels CSV
+ALL_CHANNELS_HEADER = (
+    'account_name', 'group_name', 'group_link', 'job_messages',
+    'total_messages', 'job_percentage', 'is_high_value',
+    'joined_date', 'analysis_timestamp'
+)
+
+# Column order of the account summary CSV
+ACCOUNT_SUMMARY_HEADER = (
+    'account_name', 'total_groups', 'high_value_groups',
+    'total_job_messages', 'total_messages', 'overall_job_percentage'
+)
+
+# 1 MiB write buffer so large exports reach the disk in few write() calls
+CSV_BUFFER_SIZE = 1 << 20
+
+# WAL lets the exporter read while the scrapers keep writing to the tracker DB
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA busy_timeout=5000;
+"""
 
 class AllAccountsJobChannelsExporter:
     """Export all accounts job channels to CSV"""
@@ -16,124 +41,105 @@ class AllAccountsJobChannelsExporter:
     def __init__(self):
         self.db_path = "telegram_groups_tracker.db"
     
-    def get_all_groups_from_database(self) -> List[Dict]:
-        """Get all groups from database"""
+    def _connect(self) -> sqlite3.Connection:
+        """Open the tracker database with performance PRAGMAs applied"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT group_name, group_link, joined_by_account, joined_date, 
-                   job_messages, total_messages, is_high_value
-            FROM groups
-            ORDER BY joined_by_account, job_messages DESC
-        ''')
-        
-        groups = []
-        for row in cursor.fetchall():
-            groups.append({
-                'group_name': row[0],
-                'group_link': row[1],
-                'joined_by_account': row[2],
-                'joined_date': row[3],
-                'job_messages': row[4],
-                'total_messages': row[5],
-                'is_high_value': bool(row[6]),
-                'job_percentage': round((row[4] / row[5]) * 100, 2) if row[5] > 0 else 0
-            })
-        
-        conn.close()
-        return groups
+        conn.executescript(CONNECTION_PRAGMAS)
+        return conn
     
-    def get_account_summary(self, groups: List[Dict]) -> Dict[str, Dict]:
-        """Get summary for each account"""
-        account_stats = {}
-        
-        for group in groups:
-            account = group['joined_by_account']
-            if account not in account_stats:
-                account_stats[account] = {
-                    'total_groups': 0,
-                    'high_value_groups': 0,
-                    'total_job_messages': 0,
-                    'total_messages': 0,
-                    'groups': []
-                }
-            
-            account_stats[account]['total_groups'] += 1
-            account_stats[account]['total_job_messages'] += group['job_messages']
-            account_stats[account]['total_messages'] += group['total_messages']
-            account_stats[account]['groups'].append(group)
-            
-            if group['is_high_value']:
-                account_stats[account]['high_value_groups'] += 1
-        
-        return account_stats
+    def get_all_groups_from_database(self) -> Iterator[sqlite3.Row]:
+        """Stream all groups from database as sqlite3.Row objects"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        
+        try:
+            yield from conn.execute('''
+                SELECT group_name, group_link, joined_by_account, joined_date, 
+                       job_messages, total_messages, is_high_value,
+                       CASE WHEN total_messages > 0
+                            THEN ROUND((job_messages * 1.0 / total_messages) * 100, 2)
+                            ELSE 0 END AS job_percentage
+                FROM groups
+                ORDER BY joined_by_account, job_messages DESC
+            ''')
+        finally:
+            conn.close()
     
-    def export_all_accounts_csv(self, groups: List[Dict]):
-        """Export all accounts job channels to CSV"""
+    def export_all_accounts_csv(self, groups: Iterable[sqlite3.Row]) -> Tuple[str, Dict[str, Dict]]:
+        """Export all accounts job channels to CSV and build account stats in the same pass"""
         csv_filename = f"all_accounts_job_channels_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        analysis_timestamp = datetime.now().isoformat()
+        yes_no = ('No', 'Yes')
+        account_stats = {}
+        exported = 0
         
-        with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'account_name', 'group_name', 'group_link', 'job_messages', 
-                'total_messages', 'job_percentage', 'is_high_value', 
-                'joined_date', 'analysis_timestamp'
-            ]
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+        with open(csv_filename, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(ALL_CHANNELS_HEADER)
             
             for group in groups:
-                writer.writerow({
-                    'account_name': group['joined_by_account'],
-                    'group_name': group['group_name'],
-                    'group_link': group['group_link'],
-                    'job_messages': group['job_messages'],
-                    'total_messages': group['total_messages'],
-                    'job_percentage': group['job_percentage'],
-                    'is_high_value': 'Yes' if group['is_high_value'] else 'No',
-                    'joined_date': group['joined_date'],
-                    'analysis_timestamp': datetime.now().isoformat()
-                })
-        
-        print(f"📄 Exported {len(groups)} job channels to {csv_filename}")
-        return csv_filename
+                account = group['joined_by_account']
+                job_messages = group['job_messages']
+                total_messages = group['total_messages']
+                is_high_value = bool(group['is_high_value'])
+                
+                writer.writerow((
+                    account, group['group_name'], group['group_link'],
+                    job_messages, total_messages, group['job_percentage'],
+                    yes_no[is_high_value], group['joined_date'], analysis_timestamp
+                ))
+                exported += 1
+                
+                stats = account_stats.get(account)
+                if stats is None:
+                    stats = account_stats[account] = {
+                        'total_groups': 0,
+                        'high_value_groups': 0,
+                        'total_job_messages': 0,
+                        'total_messages': 0,
+                        'top_groups': []
+                    }
+                
+                stats['total_groups'] += 1
+                stats['total_job_messages'] += job_messages
+                stats['total_messages'] += total_messages
+                
+                if is_high_value:
+                    stats['high_value_groups'] += 1
+                    # Rows arrive sorted by job_messages DESC within each account
+                    if len(stats['top_groups']) < 3:
+                        stats['top_groups'].append((group['group_name'], job_messages))
+        
+        print(f"📄 Exported {exported} job channels to {csv_filename}")
+        return csv_filename, account_stats
     
     def export_account_summary_csv(self, account_stats: Dict[str, Dict]):
         """Export account summary to CSV"""
         csv_filename = f"account_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
-        with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'account_name', 'total_groups', 'high_value_groups', 
-                'total_job_messages', 'total_messages', 'overall_job_percentage'
-            ]
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for account, stats in account_stats.items():
-                overall_percentage = (stats['total_job_messages'] / stats['total_messages']) * 100 if stats['total_messages'] > 0 else 0
-                
-                writer.writerow({
-                    'account_name': account,
-                    'total_groups': stats['total_groups'],
-                    'high_value_groups': stats['high_value_groups'],
-                    'total_job_messages': stats['total_job_messages'],
-                    'total_messages': stats['total_messages'],
-                    'overall_job_percentage': round(overall_percentage, 2)
-                })
+        with open(csv_filename, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(ACCOUNT_SUMMARY_HEADER)
+            writer.writerows(
+                (
+                    account, stats['total_groups'], stats['high_value_groups'],
+                    stats['total_job_messages'], stats['total_messages'],
+                    round((stats['total_job_messages'] / stats['total_messages']) * 100, 2) if stats['total_messages'] > 0 else 0
+                )
+                for account, stats in account_stats.items()
+            )
         
         print(f"📊 Exported account summary to {csv_filename}")
         return csv_filename
     
-    def print_summary(self, groups: List[Dict], account_stats: Dict[str, Dict]):
+    def print_summary(self, account_stats: Dict[str, Dict]):
         """Print comprehensive summary"""
         print(f"\n{'='*80}")
         print("📊 ALL ACCOUNTS JOB CHANNELS SUMMARY")
         print(f"{'='*80}")
         print(f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"🔗 Total Groups Joined: {len(groups)}")
+        total_groups = sum(stats['total_groups'] for stats in account_stats.values())
+        print(f"🔗 Total Groups Joined: {total_groups}")
         
         total_high_value = sum(stats['high_value_groups'] for stats in account_stats.values())
         total_job_messages = sum(stats['total_job_messages'] for stats in account_stats.values())
@@ -161,11 +167,10 @@ class AllAccountsJobChannelsExporter:
             print(f"    📈 Job Percentage: {account_percentage:.1f}%")
             
             # Show top groups for this account
-            high_value_groups = [g for g in stats['groups'] if g['is_high_value']]
-            if high_value_groups:
+            if stats['top_groups']:
                 print(f"    🏆 Top Groups:")
-                for i, group in enumerate(high_value_groups[:3], 1):
-                    print(f"        {i}. {group['group_name']} ({group['job_messages']}/100)")
+                for i, (group_name, job_messages) in enumerate(stats['top_groups'], 1):
+                    print(f"        {i}. {group_name} ({job_messages}/100)")
             print()
         
         print(f"{'='*80}")
@@ -176,22 +181,20 @@ class AllAccountsJobChannelsExporter:
         """Run the export process"""
         print("🚀 Starting all accounts job channels export...")
         
-        # Get all groups from database
+        # Stream groups from database in a single pass
         groups = self.get_all_groups_from_database()
+        first_group = next(groups, None)
         
-        if not groups:
+        if first_group is None:
             print("❌ No groups found in database!")
             return
         
-        # Get account summary
-        account_stats = self.get_account_summary(groups)
-        
-        # Export CSV files
-        all_channels_csv = self.export_all_accounts_csv(groups)
+        # Export CSV files, collecting the account summary on the way
+        all_channels_csv, account_stats = self.export_all_accounts_csv(chain([first_group], groups))
         summary_csv = self.export_account_summary_csv(account_stats)
         
         # Print summary
-        self.print_summary(groups, account_stats)
+        self.print_summary(account_stats)
         
         print(f"\n📁 Generated Files:")
         print(f"    📄 All Channels: {all_channels_csv}")
@@ -1,7 +1,10 @@
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+# Parse .env only once per process tree, even if config is reloaded by workers
+if not os.environ.get("ENV_LOADED"):
+    load_dotenv()
+    os.environ["ENV_LOADED"] = "1"
 
 # Database configuration
 DATABASE_PATH = "telegram_jobs.db"
@@ -45,11 +48,13 @@ SEARCH_KEYWORDS = [
 MIN_MESSAGES_FOR_SCORING = 100
 JOB_SCORE_THRESHOLD = 7.0
 FRESHER_FRIENDLY_KEYWORDS = ["fresher", "entry level", "junior", "0-1 years", "internship"]
+SCORING_JOB_KEYWORDS = ["hiring", "job", "position"]  # Precomputed per message as is_job_candidate
 
 # Crawler configuration
 MESSAGES_PER_GROUP = 100  # Changed from 200 to 100 as requested
 CRAWL_DELAY = 5  # seconds between requests
 MAX_GROUPS_PER_CITY = 50
+SEARCH_CACHE_TTL_HOURS = 24  # Reuse search results for a (city, language) pair this long
 
 # File paths
 LOGS_DIR = "logs"
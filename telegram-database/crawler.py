@@ -53,7 +53,8 @@ class JobCrawler:
     
     async def _initialize_cities(self):
         """Initialize cities in database"""
-        cities = [
+        # dict.fromkeys drops the repeated names while keeping list order
+        cities = list(dict.fromkeys([
             "Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai", "Kolkata",
             "Pune", "Ahmedabad", "Surat", "Jaipur", "Lucknow", "Kanpur",
             "Nagpur", "Indore", "Thane", "Bhopal", "Visakhapatnam", "Pimpri-Chinchwad",
@@ -84,10 +85,9 @@ class JobCrawler:
             "Satara", "Bijapur", "Rampur", "Shimoga", "Chandrapur",
             "Junagadh", "Thrissur", "Alwar", "Bardhaman", "Kulti",
             "Kakinada", "Nizamabad", "Parbhani", "Tumkur", "Hisar"
-        ]
+        ]))
         
-        for city in cities:
-            self.db.insert_city(city)
+        self.db.insert_cities_bulk(cities)
         logging.info(f"Initialized {len(cities)} cities")
     
     async def _discover_programming_groups(self):
@@ -96,24 +96,34 @@ class JobCrawler:
         cities = self.db.get_cities()
         
         # Focus on major cities first for better results
-        major_cities = [
+        major_cities = list(dict.fromkeys([
             "Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai", "Kolkata",
             "Pune", "Ahmedabad", "Surat", "Jaipur", "Lucknow", "Kanpur",
             "Nagpur", "Indore", "Thane", "Bhopal", "Visakhapatnam", "Noida",
             "Gurgaon", "Faridabad", "Ghaziabad", "Vadodara", "Ludhiana"
-        ]
+        ]))
+        known_cities = {c['name'] for c in cities}
         
         discovered_groups = []
         
         # Search in major cities first (better job opportunities)
         for city in major_cities:
-            if city in [c['name'] for c in cities]:
+            if city in known_cities:
                 logging.info(f"Searching groups in major city: {city}")
                 
                 # Search for groups in this city with fewer programming languages
                 for language in config.PROGRAMMING_LANGUAGES[:5]:  # Top 5 languages
                     try:
-                        groups = self.search_engine.search_programming_groups(city, language)
+                        # Reuse recent results for this city/language instead of hitting the APIs again
+                        groups = self.db.get_cached_search_results(
+                            city, language, max_age_hours=config.SEARCH_CACHE_TTL_HOURS
+                        )
+                        from_cache = groups is not None
+                        if not from_cache:
+                            groups = self.search_engine.search_programming_groups(city, language)
+                            # Empty results are often rate-limit skips, so only cache real hits
+                            if groups:
+                                self.db.cache_search_results(city, language, groups)
                         
                         for group in groups:
                             group_data = {
@@ -127,8 +137,9 @@ class JobCrawler:
                             discovered_groups.append(group_data)
                             logging.info(f"Discovered: {group['url']} in {city} for {language}")
                         
-                        # Rate limiting between searches
-                        await asyncio.sleep(5)  # Increased delay for major cities
+                        # Rate limiting between searches (cache hits made no API calls)
+                        if not from_cache:
+                            await asyncio.sleep(5)  # Increased delay for major cities
                         
                     except Exception as e:
                         logging.error(f"Error searching {city} for {language}: {e}")
@@ -145,47 +156,52 @@ class JobCrawler:
         """Join unique groups using universal group manager"""
         logging.info("Starting unique group joining from universal list...")
         
-        # Get unique groups for each account
-        for account in self.telegram_manager.accounts:
-            account_name = account.name
-            groups_to_join = self.universal_group_manager.get_groups_for_account(account_name, limit=10)
-            
-            logging.info(f"Account {account_name} will join {len(groups_to_join)} unique groups today")
-            
-            for group in groups_to_join:
-                try:
-                    success = await self.telegram_manager.join_group_with_account(account, group['link'])
-                    
-                    if success:
-                        # Store group in database with account tracking
-                        group_data = {
-                            'group_name': group['name'],
-                            'group_link': group['link'],
-                            'city_id': None,  # Will be updated later
-                            'source_type': 'telegram',
-                            'credibility_score': 0.0,
-                            'joined_by_account': account_name
-                        }
-                        
-                        group_id = self.db.insert_programming_group(group_data)
-                        
-                        # Track account-group assignment
-                        self.db.insert_account_group_assignment(account_name, group_id)
-                        
-                        logging.info(f"Successfully joined unique group: {group['name']} with account: {account_name}")
-                        
-                        # Rate limiting between joins
-                        await asyncio.sleep(config.CRAWL_DELAY)
-                    else:
-                        logging.warning(f"Failed to join group: {group['name']} with account: {account_name}")
-                        
-                except Exception as e:
-                    logging.error(f"Error joining group {group['name']}: {e}")
-                    continue
+        # Accounts have separate rate limits, so they join their groups concurrently
+        await asyncio.gather(*[
+            self._join_groups_for_account(account) for account in self.telegram_manager.accounts
+        ])
     
         # Show summary of unique group assignments
         await self._show_unique_group_summary()
     
+    async def _join_groups_for_account(self, account):
+        """Join today's unique groups for one account, pausing between its own joins"""
+        account_name = account.name
+        groups_to_join = self.universal_group_manager.get_groups_for_account(account_name, limit=10)
+        
+        logging.info(f"Account {account_name} will join {len(groups_to_join)} unique groups today")
+        
+        for group in groups_to_join:
+            try:
+                success = await self.telegram_manager.join_group_with_account(account, group['link'])
+                
+                if success:
+                    # Store group in database with account tracking
+                    group_data = {
+                        'group_name': group['name'],
+                        'group_link': group['link'],
+                        'city_id': None,  # Will be updated later
+                        'source_type': 'telegram',
+                        'credibility_score': 0.0,
+                        'joined_by_account': account_name
+                    }
+                    
+                    group_id = self.db.insert_programming_group(group_data)
+                    
+                    # Track account-group assignment
+                    self.db.insert_account_group_assignment(account_name, group_id)
+                    
+                    logging.info(f"Successfully joined unique group: {group['name']} with account: {account_name}")
+                    
+                    # Rate limiting between joins
+                    await asyncio.sleep(config.CRAWL_DELAY)
+                else:
+                    logging.warning(f"Failed to join group: {group['name']} with account: {account_name}")
+            
+            except Exception as e:
+                logging.error(f"Error joining group {group['name']}: {e}")
+                continue
+    
     async def _show_unique_group_summary(self):
         """Show summary of which account joined which unique groups"""
         logging.info("📊 Unique Group Assignment Summary:")
@@ -207,101 +223,104 @@ class JobCrawler:
         """Fetch messages from unique groups assigned to each account"""
         logging.info("Fetching messages from unique groups per account...")
         
-        # Get unique groups for each account
-        for account in self.telegram_manager.accounts:
-            account_name = account.name
-            unique_groups = self.universal_group_manager.get_account_unique_groups(account_name)
-            
-            logging.info(f"Fetching messages for account {account_name} from {len(unique_groups)} unique groups")
+        # Each account fetches its own groups; accounts run concurrently
+        await asyncio.gather(*[
+            self._fetch_messages_for_account(account) for account in self.telegram_manager.accounts
+        ])
+    
+    async def _fetch_messages_for_account(self, account):
+        """Fetch messages from one account's unique groups, pausing between its own requests"""
+        account_name = account.name
+        unique_groups = self.universal_group_manager.get_account_unique_groups(account_name)
         
-            for group in unique_groups:
+        logging.info(f"Fetching messages for account {account_name} from {len(unique_groups)} unique groups")
+        
+        for group in unique_groups:
             try:
-                    # Fetch messages using the specific account
+                # Fetch messages using the specific account
                 messages = await self.telegram_manager.fetch_messages_for_group(
-                        group['link'], 
+                    group['link'], 
                     limit=config.MESSAGES_PER_GROUP,
-                        account_name=account_name
+                    account_name=account_name
                 )
                 
                 if messages:
-                        # Get group from database
-                        db_groups = self.db.get_programming_groups(account_name=account_name)
-                        group_id = None
-                        for db_group in db_groups:
-                            if db_group['group_link'] == group['link']:
-                                group_id = db_group['id']
-                                break
-                        
-                        if group_id:
-                            # Store messages with account tracking
-                    for msg in messages:
-                        msg_data = {
-                                    'group_id': group_id,
-                            'message_id': msg['message_id'],
-                            'sender_id': msg['sender_id'],
-                            'sender_name': msg['sender_name'],
-                            'message_text': msg['message_text'],
-                            'timestamp': msg['timestamp'],
-                                    'is_job_post': False,
-                                    'fetched_by_account': account_name
-                        }
+                    # Get group from database
+                    db_groups = self.db.get_programming_groups(account_name=account_name)
+                    group_id = None
+                    for db_group in db_groups:
+                        if db_group['group_link'] == group['link']:
+                            group_id = db_group['id']
+                            break
+                    
+                    if group_id:
+                        # Store all messages of the group in one transaction
+                        row_ids = self.db.insert_messages_bulk([
+                            {
+                                'group_id': group_id,
+                                'message_id': msg['message_id'],
+                                'sender_id': msg['sender_id'],
+                                'sender_name': msg['sender_name'],
+                                'message_text': msg['message_text'],
+                                'timestamp': msg['timestamp'],
+                                'is_job_post': False,
+                                'fetched_by_account': account_name
+                            }
+                            for msg in messages
+                        ])
                         
-                        message_id = self.db.insert_message(msg_data)
+                        # Process through ML pipeline, storing the scores in one transaction
+                        scoring_batch = []
+                        for msg in messages:
+                            message_id = row_ids.get((group_id, str(msg['message_id'])))
+                            if message_id and msg['message_text']:
+                                scoring_batch.append((message_id, msg['message_text']))
+                        self.ml_pipeline.process_messages(scoring_batch)
                         
-                        # Process through ML pipeline
-                        if msg['message_text']:
-                            self.ml_pipeline.process_message(message_id, msg['message_text'])
-                    
-                    # Update group message count
-                            self.db.update_group_message_count(group_id, len(messages))
-                            logging.info(f"Account {account_name} processed {len(messages)} messages from {group['name']}")
+                        # Update group message count
+                        self.db.update_group_message_count(group_id, len(messages))
+                        logging.info(f"Account {account_name} processed {len(messages)} messages from {group['name']}")
                 
                 # Rate limiting
                 await asyncio.sleep(config.CRAWL_DELAY)
-                
+            
             except Exception as e:
-                    logging.error(f"Error processing group {group['name']} for account {account_name}: {e}")
+                logging.error(f"Error processing group {group['name']} for account {account_name}: {e}")
                 continue
     
     async def _score_and_filter_groups(self):
         """Score groups and identify high-quality sources"""
         logging.info("Scoring and filtering groups...")
-        groups = self.db.get_programming_groups()
         
-        for group in groups:
-            # Get messages for this group
-            messages = self.db.get_messages(group['id'], limit=100)
-            
-            if len(messages) >= config.MIN_MESSAGES_FOR_SCORING:
-                # Calculate group credibility based on message quality
-                total_score = 0
-                job_messages = 0
-                
-                for msg in messages:
-                    # Get job score for this message
-                    if any(keyword in msg['message_text'].lower() for keyword in ['hiring', 'job', 'position']):
-                        job_messages += 1
-                        total_score += 5  # Basic score for job-related messages
-                
-                # Calculate credibility score
-                if job_messages > 0:
-                    credibility_score = min(10.0, (total_score / len(messages)) + (job_messages / len(messages) * 3))
-                else:
-                    credibility_score = 0.0
-                
-                # Update group credibility
-                self.db.update_group_credibility(group['id'], credibility_score)
-                logging.info(f"Group {group['group_name']} (joined by {group.get('joined_by_account', 'unknown')}) scored: {credibility_score:.2f}")
+        # Keyword counting and the score update run as one SQL statement
+        scored_groups = self.db.update_group_credibility_scores(
+            min_messages=config.MIN_MESSAGES_FOR_SCORING,
+            sample_size=100
+        )
+        
+        for group in scored_groups:
+            logging.info(f"Group {group['group_name']} (joined by {group.get('joined_by_account', 'unknown')}) scored: {group['credibility_score']:.2f}")
     
     async def _continuous_crawling(self):
         """Continuous crawling of high-score groups"""
         logging.info("Starting continuous crawling...")
+        empty_cycles = 0
         
         while self.is_running:
             try:
                 # Get high-score groups
                 high_score_groups = self.db.get_high_score_groups(threshold=config.JOB_SCORE_THRESHOLD)
                 
+                if not high_score_groups:
+                    # Back off exponentially (capped at 1 hour) while there is nothing to crawl
+                    delay = min(3600, 300 * 2 ** empty_cycles)
+                    empty_cycles += 1
+                    logging.info(f"No high-score groups yet, next check in {delay} seconds")
+                    await asyncio.sleep(delay)
+                    continue
+                
+                empty_cycles = 0
+                
                 for group in high_score_groups:
                     if not self.is_running:
                         break
@@ -318,13 +337,13 @@ class JobCrawler:
                         account_name=joined_by_account
                     )
                     
-                    # Process new messages
-                    for msg in messages:
-                        # Check if message already exists
-                        existing_messages = self.db.get_messages(group['id'], limit=1000)
-                        if not any(existing['message_id'] == msg['message_id'] for existing in existing_messages):
-                            # Store new message
-                            msg_data = {
+                    # Keep only messages not stored yet, using one ID lookup per group
+                    existing_ids = self.db.get_message_ids(group['id'])
+                    new_messages = [msg for msg in messages if str(msg['message_id']) not in existing_ids]
+                    
+                    if new_messages:
+                        row_ids = self.db.insert_messages_bulk([
+                            {
                                 'group_id': group['id'],
                                 'message_id': msg['message_id'],
                                 'sender_id': msg['sender_id'],
@@ -334,12 +353,16 @@ class JobCrawler:
                                 'is_job_post': False,
                                 'fetched_by_account': joined_by_account
                             }
-                            
-                            message_id = self.db.insert_message(msg_data)
-                            
-                            # Process through ML pipeline
-                            if msg['message_text']:
-                                self.ml_pipeline.process_message(message_id, msg['message_text'])
+                            for msg in new_messages
+                        ])
+                        
+                        # Process through ML pipeline, storing the scores in one transaction
+                        scoring_batch = []
+                        for msg in new_messages:
+                            message_id = row_ids.get((group['id'], str(msg['message_id'])))
+                            if message_id and msg['message_text']:
+                                scoring_batch.append((message_id, msg['message_text']))
+                        self.ml_pipeline.process_messages(scoring_batch)
                     
                     # Rate limiting
                     await asyncio.sleep(config.CRAWL_DELAY)
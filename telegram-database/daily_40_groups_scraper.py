@@ -12,10 +12,19 @@ import asyncio
 import logging
 import csv
 import json
+import random
 import sqlite3
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Tuple, Optional
 import os
+from collections import defaultdict
+
+# orjson parses large group lists noticeably faster; fall back to the stdlib when absent
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Configure logging
 logging.basicConfig(
@@ -30,16 +39,69 @@ logging.basicConfig(
 # Database setup for tracking
 DATABASE_PATH = "daily_groups_tracker.db"
 
+# Group source file
+UNIVERSAL_GROUPS_PATH = "data/universal_groups.json"
+
+# 1 MiB write buffer for CSV exports
+CSV_BUFFER_SIZE = 1 << 20
+
+# Column order of the daily CSV
+DAILY_CSV_HEADER = (
+    'group_id', 'group_name', 'group_link', 'job_messages',
+    'total_messages', 'job_percentage', 'joined_by_account',
+    'joined_date', 'category', 'priority', 'is_high_value', 'analysis_timestamp'
+)
+
+# Column order of the high-value CSV
+HIGH_VALUE_CSV_HEADER = (
+    'group_id', 'group_name', 'group_link', 'job_messages',
+    'total_messages', 'job_percentage', 'joined_by_account',
+    'joined_date', 'category', 'priority', 'analysis_timestamp'
+)
+
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    PRAGMA busy_timeout=5000;
+"""
+
+def _group_csv_row(group: Dict) -> Tuple:
+    """Columns shared by the daily and high-value CSVs, in header order"""
+    return (
+        group['id'],
+        group['name'],
+        group['link'],
+        group['job_messages'],
+        group['total_messages'],
+        round(group['job_percentage'], 2),
+        group['joined_by_account'],
+        group['joined_date'],
+        group.get('category', 'programming'),
+        group.get('priority', 'medium')
+    )
+
 class DailyGroupTracker:
     """Database class to track daily groups and prevent duplicates"""
     
     def __init__(self):
+        self.conn = self._connect()
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open the tracker database with performance PRAGMAs applied"""
+        conn = sqlite3.connect(DATABASE_PATH, isolation_level=None, check_same_thread=False)
+        conn.executescript(CONNECTION_PRAGMAS)
+        return conn
+    
+    def close(self):
+        """Close the shared tracker connection"""
+        self.conn.close()
+    
     def init_database(self):
         """Initialize database tables"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         # Daily groups table
         cursor.execute('''
@@ -57,6 +119,16 @@ class DailyGroupTracker:
             )
         ''')
         
+        # Hot lookups filter by date first
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_daily_groups_date_name ON daily_groups(joined_date, group_name)"
+        )
+        
+        # Per-account drilldowns filter by account, then date
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_daily_groups_account_date ON daily_groups(joined_by_account, joined_date)"
+        )
+        
         # Daily summary table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS daily_summary (
@@ -71,71 +143,73 @@ class DailyGroupTracker:
             )
         ''')
         
-        conn.commit()
-        conn.close()
-    
-    def check_daily_groups_joined(self, date: str) -> int:
-        """Check how many groups already joined today"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "SELECT COUNT(*) FROM daily_groups WHERE joined_date = ?",
-            (date,)
-        )
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        return result[0] if result else 0
+        self.conn.commit()
     
-    def get_groups_joined_today(self, date: str) -> List[str]:
-        """Get list of groups already joined today"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+    def get_groups_joined_today(self, date: str) -> Set[str]:
+        """Get set of groups already joined today"""
+        cursor = self.conn.cursor()
         
         cursor.execute(
             "SELECT group_name FROM daily_groups WHERE joined_date = ?",
             (date,)
         )
         
-        groups = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        groups = {row[0] for row in cursor.fetchall()}
         
         return groups
     
-    def add_daily_group(self, group_data: Dict):
-        """Add a new group to daily groups table"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+    def add_daily_groups(self, groups: List[Dict]) -> List[Dict]:
+        """Add many groups in one transaction, returns the groups actually inserted"""
+        if not groups:
+            return []
+        
+        cursor = self.conn.cursor()
         
         try:
-            cursor.execute('''
-                INSERT INTO daily_groups (group_name, group_link, joined_date, joined_by_account, 
-                                        job_messages, total_messages, is_high_value)
+            self.conn.execute("BEGIN")
+            
+            # Groups already stored for these dates are skipped by INSERT OR IGNORE
+            existing = set()
+            for joined_date in {g['joined_date'] for g in groups}:
+                cursor.execute(
+                    "SELECT group_name FROM daily_groups WHERE joined_date = ?",
+                    (joined_date,)
+                )
+                existing.update((row[0], joined_date) for row in cursor.fetchall())
+            
+            cursor.executemany('''
+                INSERT OR IGNORE INTO daily_groups (group_name, group_link, joined_date, joined_by_account,
+                                                  job_messages, total_messages, is_high_value)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                group_data['name'],
-                group_data['link'],
-                group_data['joined_date'],
-                group_data['joined_by_account'],
-                group_data['job_messages'],
-                group_data['total_messages'],
-                group_data['is_high_value']
-            ))
+            ''', [
+                (
+                    g['name'],
+                    g['link'],
+                    g['joined_date'],
+                    g['joined_by_account'],
+                    g['job_messages'],
+                    g['total_messages'],
+                    g['is_high_value']
+                )
+                for g in groups
+            ])
             
-            conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            # Group already joined today
-            return False
-        finally:
-            conn.close()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        
+        inserted = []
+        for g in groups:
+            key = (g['name'], g['joined_date'])
+            if key not in existing:
+                existing.add(key)
+                inserted.append(g)
+        return inserted
     
     def update_daily_summary(self, date: str, summary_data: Dict):
         """Update daily summary"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         cursor.execute('''
             INSERT OR REPLACE INTO daily_summary 
@@ -151,13 +225,11 @@ class DailyGroupTracker:
             summary_data['high_value_groups']
         ))
         
-        conn.commit()
-        conn.close()
+        self.conn.commit()
     
     def get_daily_summary(self, date: str) -> Dict:
         """Get daily summary"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         cursor.execute(
             "SELECT * FROM daily_summary WHERE summary_date = ?",
@@ -165,7 +237,6 @@ class DailyGroupTracker:
         )
         
         result = cursor.fetchone()
-        conn.close()
         
         if result:
             return {
@@ -203,15 +274,12 @@ class Daily40GroupsScraper:
     def load_universal_groups(self) -> List[Dict]:
         """Load groups from universal_groups.json file"""
         try:
-            with open('data/universal_groups.json', 'r', encoding='utf-8') as f:
-                groups = json.load(f)
+            with open(UNIVERSAL_GROUPS_PATH, 'rb') as f:
+                groups = _json_loads(f.read())
             
-            # Filter high priority groups first
-            high_priority_groups = [g for g in groups if g.get('priority') == 'high']
-            other_groups = [g for g in groups if g.get('priority') != 'high']
-            
-            # Combine high priority first, then others
-            return high_priority_groups + other_groups
+            # High priority groups first, others keep their file order
+            groups.sort(key=lambda g: 0 if g.get('priority') == 'high' else 1)
+            return groups
             
         except FileNotFoundError:
             self.logger.error("❌ universal_groups.json file not found!")
@@ -220,28 +288,23 @@ class Daily40GroupsScraper:
             self.logger.error("❌ Error parsing universal_groups.json file!")
             return []
     
-    def get_unique_groups_for_today(self) -> List[Dict]:
-        """Get unique groups for today (not joined today)"""
+    def get_unique_groups_for_today(self) -> Tuple[List[Dict], Set[str]]:
+        """Get unique groups for today (not joined today) and the names already joined"""
         # Get groups already joined today
         already_joined = self.tracker.get_groups_joined_today(self.today)
         
         # Filter out already joined groups
-        available_groups = []
-        for group in self.universal_groups:
-            if group['name'] not in already_joined:
-                available_groups.append(group)
+        available_groups = [g for g in self.universal_groups if g['name'] not in already_joined]
         
         self.logger.info(f"📊 Available groups for today: {len(available_groups)} (already joined: {len(already_joined)})")
         
-        return available_groups
+        return available_groups, already_joined
     
     def assign_groups_to_accounts(self, available_groups: List[Dict]) -> Dict[str, List[Dict]]:
         """Assign unique groups to each account"""
-        import random
-        
-        # Shuffle groups to randomize assignment
-        shuffled_groups = available_groups.copy()
-        random.shuffle(shuffled_groups)
+        # Randomly pick only as many groups as the accounts need
+        sample_size = min(len(ACCOUNTS) * self.groups_per_account, len(available_groups))
+        shuffled_groups = random.sample(available_groups, sample_size)
         
         account_assignments = {}
         
@@ -260,247 +323,212 @@ class Daily40GroupsScraper:
                 job_count = random.randint(3, 20)
                 total_messages = 100
                 
-                processed_group = {
-                    'id': f"{account_name}_group_{j+1}",
-                    'name': group['name'],
-                    'link': group['link'],
-                    'job_messages': job_count,
-                    'total_messages': total_messages,
-                    'job_percentage': (job_count / total_messages) * 100,
-                    'is_high_value': job_count >= self.min_job_messages,
-                    'joined_by_account': account_name,
-                    'joined_date': self.today,
-                    'category': group.get('category', 'programming'),
-                    'priority': group.get('priority', 'medium')
-                }
+                # Extend a copy of the loaded group rather than building a new dict
+                processed_group = group.copy()
+                processed_group.update(
+                    id=f"{account_name}_group_{j+1}",
+                    job_messages=job_count,
+                    total_messages=total_messages,
+                    job_percentage=(job_count / total_messages) * 100,
+                    is_high_value=job_count >= self.min_job_messages,
+                    joined_by_account=account_name,
+                    joined_date=self.today
+                )
+                processed_group.setdefault('category', 'programming')
+                processed_group.setdefault('priority', 'medium')
                 processed_groups.append(processed_group)
             
             account_assignments[account_name] = processed_groups
         
         return account_assignments
     
-    def simulate_group_joining(self, account: Dict[str, Any], assigned_groups: List[Dict]) -> List[Dict]:
+    async def simulate_group_joining(self, account: Dict[str, Any], assigned_groups: List[Dict]) -> List[Dict]:
         """Simulate joining groups for an account"""
         account_name = account['name']
         
         self.logger.info(f"🔗 Account {account_name}: Starting to join {len(assigned_groups)} unique groups")
         
-        joined_groups = []
+        for group in assigned_groups:
+            # Simulate delay between joins
+            await asyncio.sleep(0.1)
+        
+        # Add all groups to database in one transaction
+        joined_groups = self.tracker.add_daily_groups(assigned_groups)
+        joined_ids = {id(g) for g in joined_groups}
         
         for group in assigned_groups:
-            # Add to database
-            if self.tracker.add_daily_group(group):
-                joined_groups.append(group)
-                self.logger.info(f"✅ Successfully joined: {group['name']} ({group['job_messages']}/100 job messages)")
+            if id(group) in joined_ids:
+                self.logger.info("✅ Successfully joined: %s (%d/100 job messages)", group['name'], group['job_messages'])
             else:
-                self.logger.warning(f"⚠️ Group {group['name']} already joined today, skipping...")
-            
-            # Simulate delay between joins
-            import time
-            time.sleep(0.1)
+                self.logger.warning("⚠️ Group %s already joined today, skipping...", group['name'])
         
         self.logger.info(f"Account {account_name}: Joined {len(joined_groups)}/{len(assigned_groups)} unique groups")
         return joined_groups
     
-    def export_daily_csv(self, all_groups: List[Dict]):
-        """Export daily groups to CSV with date in filename"""
+    def export_csvs(self, all_groups: List[Dict], high_value_count: int) -> Tuple[Optional[str], Optional[str]]:
+        """Export daily and high-value groups to date-named CSVs, streaming rows through writerows"""
         if not all_groups:
             self.logger.info("No groups to export")
-            return None
+            self.logger.info("No high-value channels found to export")
+            return None, None
         
-        # Date-based filename
+        # Date-based filenames
         date_str = datetime.now().strftime('%Y%m%d')
-        csv_filename = f"daily_job_channels_{date_str}.csv"
-        
-        with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'group_id', 'group_name', 'group_link', 'job_messages', 
-                'total_messages', 'job_percentage', 'joined_by_account', 
-                'joined_date', 'category', 'priority', 'is_high_value', 'analysis_timestamp'
-            ]
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for group in all_groups:
-                writer.writerow({
-                    'group_id': group['id'],
-                    'group_name': group['name'],
-                    'group_link': group['link'],
-                    'job_messages': group['job_messages'],
-                    'total_messages': group['total_messages'],
-                    'job_percentage': round(group['job_percentage'], 2),
-                    'joined_by_account': group['joined_by_account'],
-                    'joined_date': group['joined_date'],
-                    'category': group.get('category', 'programming'),
-                    'priority': group.get('priority', 'medium'),
-                    'is_high_value': 'Yes' if group['is_high_value'] else 'No',
-                    'analysis_timestamp': datetime.now().isoformat()
-                })
-        
-        self.logger.info(f"📄 Exported {len(all_groups)} groups to {csv_filename}")
-        return csv_filename
-    
-    def export_high_value_csv(self, all_groups: List[Dict]):
-        """Export high-value groups to CSV with date in filename"""
-        high_value_channels = [g for g in all_groups if g['is_high_value']]
+        daily_filename = f"daily_job_channels_{date_str}.csv"
+        high_value_filename = f"high_value_job_channels_{date_str}.csv"
         
-        if not high_value_channels:
+        analysis_timestamp = datetime.now().isoformat()
+        
+        with open(daily_filename, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as daily_file:
+            daily_writer = csv.writer(daily_file)
+            daily_writer.writerow(DAILY_CSV_HEADER)
+            daily_writer.writerows(
+                _group_csv_row(group) + ('Yes' if group['is_high_value'] else 'No', analysis_timestamp)
+                for group in all_groups
+            )
+        
+        self.logger.info(f"📄 Exported {len(all_groups)} groups to {daily_filename}")
+        
+        # Leave any existing high-value file alone when there is nothing to write
+        if not high_value_count:
             self.logger.info("No high-value channels found to export")
-            return None
+            return daily_filename, None
+        
+        with open(high_value_filename, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as high_value_file:
+            high_value_writer = csv.writer(high_value_file)
+            high_value_writer.writerow(HIGH_VALUE_CSV_HEADER)
+            high_value_writer.writerows(
+                _group_csv_row(group) + (analysis_timestamp,)
+                for group in all_groups if group['is_high_value']
+            )
         
-        # Date-based filename
-        date_str = datetime.now().strftime('%Y%m%d')
-        csv_filename = f"high_value_job_channels_{date_str}.csv"
-        
-        with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'group_id', 'group_name', 'group_link', 'job_messages', 
-                'total_messages', 'job_percentage', 'joined_by_account', 
-                'joined_date', 'category', 'priority', 'analysis_timestamp'
-            ]
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for group in high_value_channels:
-                writer.writerow({
-                    'group_id': group['id'],
-                    'group_name': group['name'],
-                    'group_link': group['link'],
-                    'job_messages': group['job_messages'],
-                    'total_messages': group['total_messages'],
-                    'job_percentage': round(group['job_percentage'], 2),
-                    'joined_by_account': group['joined_by_account'],
-                    'joined_date': group['joined_date'],
-                    'category': group.get('category', 'programming'),
-                    'priority': group.get('priority', 'medium'),
-                    'analysis_timestamp': datetime.now().isoformat()
-                })
-        
-        self.logger.info(f"📄 Exported {len(high_value_channels)} high-value channels to {csv_filename}")
-        return csv_filename
+        self.logger.info(f"📄 Exported {high_value_count} high-value channels to {high_value_filename}")
+        return daily_filename, high_value_filename
     
-    def print_daily_summary(self, all_groups: List[Dict]):
-        """Print comprehensive daily summary"""
-        total_groups = len(all_groups)
-        high_value_groups = len([g for g in all_groups if g['is_high_value']])
-        total_messages = sum(g['total_messages'] for g in all_groups)
-        total_job_messages = sum(g['job_messages'] for g in all_groups)
-        
-        print(f"\n{'='*80}")
-        print("📊 DAILY 40 GROUPS JOB SCRAPING SUMMARY")
-        print(f"{'='*80}")
-        print(f"📅 Date: {self.today}")
-        print(f"📁 Source: data/universal_groups.json ({len(self.universal_groups)} total groups)")
-        print(f"🎯 Target: 40 groups (10 per account)")
-        print(f"🔗 Total Groups Joined: {total_groups}")
-        print(f"✅ High-Value Groups: {high_value_groups}")
-        print(f"📨 Total Messages Fetched: {total_messages}")
-        print(f"💼 Total Job Messages: {total_job_messages}")
+    def print_daily_summary(self, summary_data: Dict, account_stats: Dict[str, Dict], high_value_channels: List[Dict]):
+        """Print comprehensive daily summary from the totals gathered by run_daily_workflow"""
+        total_groups = summary_data['total_groups']
+        high_value_groups = summary_data['high_value_groups']
+        total_messages = summary_data['total_messages']
+        total_job_messages = summary_data['total_job_messages']
+        
+        # Build the whole report and write it with a single print
+        lines = []
+        lines.append(f"\n{'='*80}")
+        lines.append("📊 DAILY 40 GROUPS JOB SCRAPING SUMMARY")
+        lines.append(f"{'='*80}")
+        lines.append(f"📅 Date: {self.today}")
+        lines.append(f"📁 Source: data/universal_groups.json ({len(self.universal_groups)} total groups)")
+        lines.append(f"🎯 Target: 40 groups (10 per account)")
+        lines.append(f"🔗 Total Groups Joined: {total_groups}")
+        lines.append(f"✅ High-Value Groups: {high_value_groups}")
+        lines.append(f"📨 Total Messages Fetched: {total_messages}")
+        lines.append(f"💼 Total Job Messages: {total_job_messages}")
         
         if total_messages > 0:
             overall_job_percentage = (total_job_messages / total_messages) * 100
-            print(f"📈 Overall Job Percentage: {overall_job_percentage:.1f}%")
+            lines.append(f"📈 Overall Job Percentage: {overall_job_percentage:.1f}%")
         
         # Show account-wise breakdown
-        print(f"\n👥 ACCOUNT BREAKDOWN:")
-        print(f"{'='*80}")
-        
-        account_stats = {}
-        for group in all_groups:
-            account = group['joined_by_account']
-            if account not in account_stats:
-                account_stats[account] = {'total': 0, 'high_value': 0, 'job_messages': 0}
-            
-            account_stats[account]['total'] += 1
-            account_stats[account]['job_messages'] += group['job_messages']
-            if group['is_high_value']:
-                account_stats[account]['high_value'] += 1
+        lines.append(f"\n👥 ACCOUNT BREAKDOWN:")
+        lines.append(f"{'='*80}")
         
         for account, stats in account_stats.items():
-            print(f"👤 {account}:")
-            print(f"    🔗 Groups Joined: {stats['total']}")
-            print(f"    ✅ High-Value Groups: {stats['high_value']}")
-            print(f"    💼 Total Job Messages: {stats['job_messages']}")
+            lines.append(f"👤 {account}:")
+            lines.append(f"    🔗 Groups Joined: {stats['total']}")
+            lines.append(f"    ✅ High-Value Groups: {stats['high_value']}")
+            lines.append(f"    💼 Total Job Messages: {stats['job_messages']}")
         
-        print(f"\n🏆 HIGH-VALUE CHANNELS (10+ job messages):")
-        print(f"{'='*80}")
+        lines.append(f"\n🏆 HIGH-VALUE CHANNELS (10+ job messages):")
+        lines.append(f"{'='*80}")
         
-        high_value_channels = [g for g in all_groups if g['is_high_value']]
         high_value_channels.sort(key=lambda x: x['job_messages'], reverse=True)
         
         for i, group in enumerate(high_value_channels, 1):
-            print(f"{i:2d}. 📢 {group['name']}")
-            print(f"    🔗 {group['link']}")
-            print(f"    💼 {group['job_messages']}/{group['total_messages']} ({group['job_percentage']:.1f}%)")
-            print(f"    👤 Joined by: {group['joined_by_account']}")
-            print(f"    🏷️ Category: {group.get('category', 'programming')}")
-            print(f"    ⭐ Priority: {group.get('priority', 'medium')}")
-        
-        print(f"\n{'='*80}")
-        print("✅ Daily scraping completed successfully!")
-        print("🔒 सभी groups unique हैं और duplicate नहीं हैं!")
-        print("📅 Date-based CSV files generated!")
-        print("🔄 Next day different groups will be joined!")
-        print(f"{'='*80}")
+            lines.append(f"{i:2d}. 📢 {group['name']}")
+            lines.append(f"    🔗 {group['link']}")
+            lines.append(f"    💼 {group['job_messages']}/{group['total_messages']} ({group['job_percentage']:.1f}%)")
+            lines.append(f"    👤 Joined by: {group['joined_by_account']}")
+            lines.append(f"    🏷️ Category: {group.get('category', 'programming')}")
+            lines.append(f"    ⭐ Priority: {group.get('priority', 'medium')}")
+        
+        lines.append(f"\n{'='*80}")
+        lines.append("✅ Daily scraping completed successfully!")
+        lines.append("🔒 सभी groups unique हैं और duplicate नहीं हैं!")
+        lines.append("📅 Date-based CSV files generated!")
+        lines.append("🔄 Next day different groups will be joined!")
+        lines.append(f"{'='*80}")
+        
+        print("\n".join(lines))
     
     async def run_daily_workflow(self):
         """Run the complete daily workflow with 40 groups"""
         self.logger.info("🚀 Starting daily 40 groups job scraping workflow...")
         
-        # Check if already joined groups today
-        already_joined = self.tracker.check_daily_groups_joined(self.today)
-        if already_joined >= 40:
-            self.logger.warning(f"⚠️ Already joined {already_joined} groups today! Maximum reached.")
-            return []
-        
-        # Get available groups for today
-        available_groups = self.get_unique_groups_for_today()
-        
-        if len(available_groups) < 40:
-            self.logger.warning(f"⚠️ Only {len(available_groups)} groups available, need 40!")
-            return []
-        
-        # Assign groups to accounts
-        account_assignments = self.assign_groups_to_accounts(available_groups)
-        
-        all_groups = []
-        
-        # Process each account
-        for account in ACCOUNTS:
-            account_name = account['name']
-            assigned_groups = account_assignments[account_name]
+        try:
+            # Get available groups for today, one query also gives today's joined count
+            available_groups, already_joined = self.get_unique_groups_for_today()
             
-            self.logger.info(f"👤 Processing account: {account_name}")
+            # Check if already joined groups today
+            if len(already_joined) >= 40:
+                self.logger.warning(f"⚠️ Already joined {len(already_joined)} groups today! Maximum reached.")
+                return []
             
-            # Join unique groups for this account
-            joined_groups = self.simulate_group_joining(account, assigned_groups)
-            all_groups.extend(joined_groups)
+            if len(available_groups) < 40:
+                self.logger.warning(f"⚠️ Only {len(available_groups)} groups available, need 40!")
+                return []
             
-            # Simulate delay between accounts
-            await asyncio.sleep(0.5)
-        
-        # Export CSV files with date in filename
-        daily_csv = self.export_daily_csv(all_groups)
-        high_value_csv = self.export_high_value_csv(all_groups)
-        
-        # Update daily summary
-        summary_data = {
-            'total_groups': len(all_groups),
-            'total_accounts': len(ACCOUNTS),
-            'total_job_messages': sum(g['job_messages'] for g in all_groups),
-            'total_messages': sum(g['total_messages'] for g in all_groups),
-            'high_value_groups': len([g for g in all_groups if g['is_high_value']])
-        }
-        self.tracker.update_daily_summary(self.today, summary_data)
-        
-        # Print summary
-        self.print_daily_summary(all_groups)
-        
-        self.logger.info(f"🎉 Daily workflow completed! Joined {len(all_groups)} groups total")
-        
-        return all_groups
+            # Assign groups to accounts
+            account_assignments = self.assign_groups_to_accounts(available_groups)
+            
+            # Process all accounts concurrently, each joining its own unique groups
+            self.logger.info(f"👤 Processing accounts: {', '.join(a['name'] for a in ACCOUNTS)}")
+            joined_per_account = await asyncio.gather(*(
+                self.simulate_group_joining(account, account_assignments[account['name']])
+                for account in ACCOUNTS
+            ))
+            
+            # Flatten the per-account results and gather every total the summary needs in the same pass
+            all_groups = []
+            total_job_messages = 0
+            total_messages = 0
+            high_value_groups = 0
+            account_stats = defaultdict(lambda: {'total': 0, 'high_value': 0, 'job_messages': 0})
+            high_value_channels = []
+            for joined_groups in joined_per_account:
+                for group in joined_groups:
+                    all_groups.append(group)
+                    stats = account_stats[group['joined_by_account']]
+                    stats['total'] += 1
+                    stats['job_messages'] += group['job_messages']
+                    total_job_messages += group['job_messages']
+                    total_messages += group['total_messages']
+                    if group['is_high_value']:
+                        stats['high_value'] += 1
+                        high_value_groups += 1
+                        high_value_channels.append(group)
+            
+            # Export CSV files with date in filename
+            daily_csv, high_value_csv = self.export_csvs(all_groups, high_value_groups)
+            
+            # Update daily summary
+            summary_data = {
+                'total_groups': len(all_groups),
+                'total_accounts': len(ACCOUNTS),
+                'total_job_messages': total_job_messages,
+                'total_messages': total_messages,
+                'high_value_groups': high_value_groups
+            }
+            self.tracker.update_daily_summary(self.today, summary_data)
+            
+            # Print summary
+            self.print_daily_summary(summary_data, account_stats, high_value_channels)
+            
+            self.logger.info(f"🎉 Daily workflow completed! Joined {len(all_groups)} groups total")
+            
+            return all_groups
+        finally:
+            self.tracker.close()
 
 async def main():
     """Main function to run the daily 40 groups scraper"""
@@ -37,6 +37,13 @@ from universal_group_manager import UniversalGroupManager
 from database.database import DatabaseManager
 import config
 
+# pyahocorasick matches every keyword in one pass over the text; fall back to
+# per-keyword substring checks when the C extension is not installed
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -47,6 +54,13 @@ logging.basicConfig(
     ]
 )
 
+# Column order of the high-value channels CSV
+HIGH_VALUE_CSV_HEADER = (
+    'group_id', 'group_name', 'group_link', 'job_messages',
+    'total_messages', 'job_percentage', 'joined_by_account',
+    'analysis_timestamp'
+)
+
 @dataclass
 class GroupAnalysisResult:
     """Result of analyzing a group for job content"""
@@ -101,11 +115,46 @@ class DailyJobScraper:
             ]
         }
         
+        # Category weights for the confidence score
+        self.category_weights = {
+            'job_indicators': 3,         # High weight
+            'roles': 2,                  # Medium-high weight
+            'technologies': 1.5,         # Medium weight
+            'location_indicators': 1     # Low weight
+        }
+        
+        # Shorter messages are classified as non-job without scanning
+        self.min_message_length = 20
+        
+        # Keyword automaton and score normalizer, built once instead of per message
+        self.keyword_automaton = self._build_keyword_automaton()
+        self.max_possible_score = sum(
+            len(self.job_keywords[category]) * weight
+            for category, weight in self.category_weights.items()
+        )
+        
         # Daily targets
         self.groups_per_account = 10
         self.messages_per_group = 100
         self.min_job_messages = 10
+        self.max_concurrent_fetches = 4
+        
+    def _build_keyword_automaton(self):
+        """Build an Aho-Corasick automaton mapping each keyword to its categories"""
+        if ahocorasick is None:
+            return None
         
+        keyword_categories = {}
+        for category, keywords in self.job_keywords.items():
+            for keyword in keywords:
+                keyword_categories.setdefault(keyword, []).append(category)
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, categories in keyword_categories.items():
+            automaton.add_word(keyword, (keyword, tuple(categories)))
+        automaton.make_automaton()
+        return automaton
+    
     def is_job_message(self, message_text: str) -> Tuple[bool, float]:
         """
         Analyze if a message is job-related using keyword matching
@@ -116,36 +165,35 @@ class DailyJobScraper:
         Returns:
             Tuple of (is_job_message, confidence_score)
         """
-        if not message_text:
+        # Stickers, emoji and one-word replies cannot carry a job post
+        if not message_text or len(message_text) < self.min_message_length:
             return False, 0.0
         
         # Convert to lowercase for case-insensitive matching
         text_lower = message_text.lower()
         
         # Count matches for each keyword category
-        category_matches = {}
-        
-        for category, keywords in self.job_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in text_lower)
-            category_matches[category] = matches
+        if self.keyword_automaton is not None:
+            # Single scan; each keyword counts once however often it occurs
+            category_matches = dict.fromkeys(self.job_keywords, 0)
+            for keyword, categories in {value for _, value in self.keyword_automaton.iter(text_lower)}:
+                for category in categories:
+                    category_matches[category] += 1
+        else:
+            category_matches = {}
+            
+            for category, keywords in self.job_keywords.items():
+                matches = sum(1 for keyword in keywords if keyword in text_lower)
+                category_matches[category] = matches
         
         # Calculate weighted score
-        weighted_score = (
-            category_matches['job_indicators'] * 3 +  # High weight
-            category_matches['roles'] * 2 +           # Medium-high weight
-            category_matches['technologies'] * 1.5 +   # Medium weight
-            category_matches['location_indicators'] * 1 # Low weight
+        weighted_score = sum(
+            category_matches[category] * weight
+            for category, weight in self.category_weights.items()
         )
         
         # Normalize score (0-1 range)
-        max_possible_score = (
-            len(self.job_keywords['job_indicators']) * 3 +
-            len(self.job_keywords['roles']) * 2 +
-            len(self.job_keywords['technologies']) * 1.5 +
-            len(self.job_keywords['location_indicators']) * 1
-        )
-        
-        confidence = min(weighted_score / max_possible_score, 1.0)
+        confidence = min(weighted_score / self.max_possible_score, 1.0)
         
         # Consider it a job message if confidence > 0.1 (10%)
         # and at least one job indicator is present
@@ -173,9 +221,13 @@ class DailyJobScraper:
             self.logger.warning(f"No available groups for {account['name']}")
             return []
         
+        # Skip groups this account already joined today, e.g. when a run is retried
+        already_joined = self.db.get_group_links_joined_on(datetime.now().date().isoformat(), account['name'])
+        
         # Select groups to join (up to 10)
-        groups_to_join = available_groups[:self.groups_per_account]
+        groups_to_join = [g for g in available_groups if g['link'] not in already_joined][:self.groups_per_account]
         joined_groups = []
+        groups_batch = []
         
         for group in groups_to_join:
             try:
@@ -188,23 +240,18 @@ class DailyJobScraper:
                     # Mark group as assigned to this account
                     self.group_manager.assign_group_to_account(account['name'], group['id'])
                     
-                    # Store group in database
-                    group_data = {
+                    # Queue group for the database, stored after the join loop
+                    groups_batch.append({
                         'group_name': group['name'],
                         'group_link': group['link'],
                         'group_id': group.get('group_id'),
                         'joined_by_account': account['name'],
                         'source_type': 'telegram',
                         'credibility_score': group.get('credibility_score', 0.0)
-                    }
-                    
-                    group_db_id = self.db.insert_programming_group(group_data)
-                    
-                    # Record assignment
-                    self.db.insert_account_group_assignment(account['name'], group_db_id)
+                    })
                     
                     joined_groups.append({
-                        'id': group_db_id,
+                        'id': None,
                         'name': group['name'],
                         'link': group['link'],
                         'account': account['name']
@@ -222,6 +269,17 @@ class DailyJobScraper:
                 self.logger.error(f"Error joining group {group['name']}: {e}")
                 continue
         
+        # Store joined groups and their assignments in one transaction; the joins themselves
+        # already happened, so a database error must not lose the account's joined groups
+        try:
+            group_db_ids = self.db.bulk_insert_groups_and_assignments(groups_batch, account['name'])
+        except Exception as e:
+            self.logger.error(f"Error storing joined groups for {account['name']}: {e}")
+            group_db_ids = {}
+        
+        for joined_group in joined_groups:
+            joined_group['id'] = group_db_ids.get(joined_group['link'])
+        
         self.logger.info(f"Account {account['name']}: Joined {len(joined_groups)}/{self.groups_per_account} groups")
         return joined_groups
     
@@ -261,34 +319,42 @@ class DailyJobScraper:
             # Analyze messages for job content
             job_count = 0
             stored_messages = []
+            fallback_timestamp = datetime.now().isoformat()
+            
+            # Bind per-message lookups to locals once for the hot loop
+            is_job_message = self.is_job_message
+            store_message = stored_messages.append
+            group_id = group['id']
+            account_name = account['name']
             
             for message in messages:
-                message_text = message.get('text', '') or message.get('message', '')
+                message_text = message.get('text') or message.get('message') or ''
                 
                 if message_text:
                     # Check if it's a job message
-                    is_job, confidence = self.is_job_message(message_text)
+                    is_job, confidence = is_job_message(message_text)
                     
                     # Store message in database
                     message_data = {
-                        'group_id': group['id'],
+                        'group_id': group_id,
                         'message_id': message.get('id', ''),
                         'sender_id': message.get('sender_id', ''),
-                        'sender_name': message.get('sender', '') or message.get('sender_name', ''),
+                        'sender_name': message.get('sender') or message.get('sender_name') or '',
                         'message_text': message_text,
-                        'timestamp': message.get('date', datetime.now().isoformat()),
+                        'timestamp': message.get('date', fallback_timestamp),
                         'is_job_post': is_job,
                         'job_score': confidence,
-                        'fetched_by_account': account['name']
+                        'fetched_by_account': account_name
                     }
                     
-                    # Insert message into database
-                    self.db.insert_message(message_data)
-                    stored_messages.append(message_data)
+                    store_message(message_data)
                     
                     if is_job:
                         job_count += 1
             
+            # Insert all messages of this group in one transaction
+            self.db.insert_messages_bulk(stored_messages)
+            
             # Calculate job percentage
             total_messages = len(messages)
             job_percentage = (job_count / total_messages * 100) if total_messages > 0 else 0.0
@@ -327,56 +393,62 @@ class DailyJobScraper:
                 analysis_timestamp=datetime.now().isoformat()
             )
     
-    def export_high_value_channels(self, results: List[GroupAnalysisResult]):
+    async def export_high_value_channels(self, high_value_channels: List[GroupAnalysisResult]):
         """
         Export high-value channels to CSV file
         
         Args:
-            results: List of group analysis results
+            high_value_channels: High-value group analysis results
         """
-        high_value_channels = [r for r in results if r.is_high_value]
-        
         if not high_value_channels:
             self.logger.info("No high-value channels found to export")
             return
         
         csv_filename = f"high_value_job_channels_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
-        with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'group_id', 'group_name', 'group_link', 'job_messages', 
-                'total_messages', 'job_percentage', 'joined_by_account', 
-                'analysis_timestamp'
-            ]
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for result in high_value_channels:
-                writer.writerow({
-                    'group_id': result.group_id,
-                    'group_name': result.group_name,
-                    'group_link': result.group_link,
-                    'job_messages': result.job_messages,
-                    'total_messages': result.total_messages,
-                    'job_percentage': round(result.job_percentage, 2),
-                    'joined_by_account': result.joined_by_account,
-                    'analysis_timestamp': result.analysis_timestamp
-                })
+        # Write in a worker thread so file IO does not block the event loop
+        await asyncio.to_thread(self._write_high_value_csv, csv_filename, high_value_channels)
         
         self.logger.info(f"📄 Exported {len(high_value_channels)} high-value channels to {csv_filename}")
     
-    def print_daily_summary(self, results: List[GroupAnalysisResult]):
+    def _write_high_value_csv(self, csv_filename: str, high_value_channels: List[GroupAnalysisResult]):
+        """Write high-value channel rows to csv_filename (blocking)"""
+        with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(HIGH_VALUE_CSV_HEADER)
+            writer.writerows(
+                (
+                    result.group_id,
+                    result.group_name,
+                    result.group_link,
+                    result.job_messages,
+                    result.total_messages,
+                    round(result.job_percentage, 2),
+                    result.joined_by_account,
+                    result.analysis_timestamp
+                )
+                for result in high_value_channels
+            )
+    
+    def print_daily_summary(self, results: List[GroupAnalysisResult],
+                            high_value_channels: List[GroupAnalysisResult]):
         """
         Print daily summary report
         
         Args:
             results: List of group analysis results
+            high_value_channels: The high-value subset of results
         """
+        # Gather totals in one pass
         total_groups = len(results)
-        high_value_groups = len([r for r in results if r.is_high_value])
-        total_messages = sum(r.total_messages for r in results)
-        total_job_messages = sum(r.job_messages for r in results)
+        total_messages = 0
+        total_job_messages = 0
+        
+        for result in results:
+            total_messages += result.total_messages
+            total_job_messages += result.job_messages
+        
+        high_value_groups = len(high_value_channels)
         
         print(f"\n{'='*80}")
         print("📊 DAILY JOB SCRAPING SUMMARY")
@@ -394,7 +466,6 @@ class DailyJobScraper:
         print(f"\n🏆 HIGH-VALUE CHANNELS ({self.min_job_messages}+ job messages):")
         print(f"{'='*80}")
         
-        high_value_channels = [r for r in results if r.is_high_value]
         for i, result in enumerate(high_value_channels, 1):
             print(f"{i:2d}. 📢 {result.group_name}")
             print(f"    🔗 {result.group_link}")
@@ -405,6 +476,33 @@ class DailyJobScraper:
         print("✅ Daily scraping completed successfully!")
         print(f"{'='*80}")
     
+    async def _process_account(self, account: Dict[str, Any]) -> Tuple[int, List[GroupAnalysisResult]]:
+        """
+        Join groups for one account, then fetch and analyze each of them
+        
+        Args:
+            account: Account configuration dictionary
+            
+        Returns:
+            Tuple of (number of groups joined, analysis results)
+        """
+        self.logger.info(f"👤 Processing account: {account['name']}")
+        
+        # Join 10 groups for this account
+        joined_groups = await self.join_groups_for_account(account)
+        
+        # Fetch and analyze joined groups concurrently; the semaphore caps
+        # in-flight requests per account to stay under rate limits
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+        
+        async def fetch_one(group: Dict) -> GroupAnalysisResult:
+            async with semaphore:
+                return await self.fetch_and_analyze_group_messages(group, account)
+        
+        results = await asyncio.gather(*(fetch_one(group) for group in joined_groups))
+        
+        return len(joined_groups), list(results)
+    
     async def run_daily_workflow(self):
         """
         Run the complete daily workflow:
@@ -416,30 +514,25 @@ class DailyJobScraper:
         """
         self.logger.info("🚀 Starting daily job scraping workflow...")
         
+        # Accounts use independent sessions, so process them concurrently
+        account_outcomes = await asyncio.gather(*(
+            self._process_account(account) for account in config.ACCOUNTS
+        ))
+        
         all_results = []
         total_joined_groups = 0
+        for joined_count, results in account_outcomes:
+            total_joined_groups += joined_count
+            all_results.extend(results)
         
-        # Process each account
-        for account in config.ACCOUNTS:
-            self.logger.info(f"�� Processing account: {account['name']}")
-            
-            # Join 10 groups for this account
-            joined_groups = await self.join_groups_for_account(account)
-            total_joined_groups += len(joined_groups)
-            
-            # Fetch and analyze messages from each joined group
-            for group in joined_groups:
-                result = await self.fetch_and_analyze_group_messages(group, account)
-                all_results.append(result)
-                
-                # Add delay between groups to avoid rate limiting
-                await asyncio.sleep(1)
+        # Filter high-value channels once for both the export and the summary
+        high_value_channels = [r for r in all_results if r.is_high_value]
         
         # Export high-value channels to CSV
-        self.export_high_value_channels(all_results)
+        await self.export_high_value_channels(high_value_channels)
         
         # Print summary
-        self.print_daily_summary(all_results)
+        self.print_daily_summary(all_results, high_value_channels)
         
         self.logger.info(f"🎉 Daily workflow completed! Joined {total_joined_groups} groups, "
                         f"analyzed {len(all_results)} groups")
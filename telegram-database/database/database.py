@@ -1,13 +1,126 @@
 import sqlite3
 import json
 import logging
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 import config
 
+# orjson encodes the per-score tag lists noticeably faster; fall back to the stdlib when absent.
+# tags is a TEXT column, so the bytes orjson returns are decoded before binding.
+try:
+    import orjson
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_dumps = json.dumps
+
+# Applied to every connection: WAL lets the exporter/readers run alongside the
+# crawler's writes, and busy_timeout waits out short locks instead of failing.
+# page_size only takes effect while the file is still empty, so it must come
+# before journal_mode; existing WAL databases keep the page size they were built with.
+CONNECTION_PRAGMAS = """
+    PRAGMA page_size=8192;
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-131072;
+    PRAGMA mmap_size=268435456;
+    PRAGMA busy_timeout=5000;
+"""
+
+# Statements shared by the single-row and bulk write paths. Reusing the exact same
+# text lets the persistent connection's statement cache hand back the prepared statement.
+_SQL_INSERT_CITY = "INSERT OR IGNORE INTO cities (name, state, country) VALUES (?, ?, ?)"
+
+_SQL_INSERT_PROGRAMMING_GROUP = """
+    INSERT OR IGNORE INTO programming_groups 
+    (group_name, group_link, group_id, city_id, source_type, credibility_score, joined_by_account)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_GROUP_IDS_BY_LINK = """
+    SELECT group_link, id FROM programming_groups 
+    WHERE group_link IN (SELECT value FROM json_each(?))
+"""
+
+_SQL_INSERT_ASSIGNMENT = """
+    INSERT OR IGNORE INTO account_group_assignments 
+    (account_name, group_id, assignment_date)
+    VALUES (?, ?, ?)
+"""
+
+_SQL_INSERT_JOB_SCORE = """
+    INSERT INTO job_scores 
+    (message_id, salary_score, contact_score, website_score, name_score, 
+     skill_score, experience_score, location_score, remote_score, 
+     fresher_friendly_score, overall_score, tags)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_MESSAGE = """
+    INSERT OR IGNORE INTO messages 
+    (group_id, message_id, sender_id, sender_name, message_text, 
+     timestamp, is_job_post, job_score, is_job_candidate, fetched_by_account)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_MESSAGE_IDS_BY_TELEGRAM_ID = """
+    SELECT message_id, id FROM messages 
+    WHERE group_id = ? AND message_id IN (SELECT value FROM json_each(?))
+"""
+
+# Case-insensitive substring match of any scoring keyword, in a single regex scan
+_JOB_CANDIDATE_RE = re.compile('|'.join(map(re.escape, config.SCORING_JOB_KEYWORDS)), re.IGNORECASE)
+
+def is_job_candidate(message_text: Optional[str]) -> bool:
+    """Keyword pre-check for group scoring, stored with each message at insert time"""
+    return bool(message_text) and _JOB_CANDIDATE_RE.search(message_text) is not None
+
+def _rows_as_dicts(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    """Fetch the remaining rows of an executed query as dicts keyed by column name"""
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def _programming_group_row(group_data: Dict[str, Any]) -> tuple:
+    """Parameters for one programming_groups insert"""
+    return (
+        group_data['group_name'],
+        group_data['group_link'],
+        group_data.get('group_id'),
+        group_data.get('city_id'),
+        group_data.get('source_type', 'telegram'),
+        group_data.get('credibility_score', 0.0),
+        group_data.get('joined_by_account')
+    )
+
+def _job_score_row(job_score_data: Dict[str, Any]) -> tuple:
+    """Parameters for one job_scores insert"""
+    return (
+        job_score_data['message_id'],
+        job_score_data.get('salary_score', 0.0),
+        job_score_data.get('contact_score', 0.0),
+        job_score_data.get('website_score', 0.0),
+        job_score_data.get('name_score', 0.0),
+        job_score_data.get('skill_score', 0.0),
+        job_score_data.get('experience_score', 0.0),
+        job_score_data.get('location_score', 0.0),
+        job_score_data.get('remote_score', 0.0),
+        job_score_data.get('fresher_friendly_score', 0.0),
+        job_score_data.get('overall_score', 0.0),
+        _json_dumps(job_score_data.get('tags', []))
+    )
+
 class DatabaseManager:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or config.DATABASE_PATH
+        # One long-lived connection per thread keeps SQLite's page cache warm across calls
+        self._local = threading.local()
+        # City IDs keyed by name (cities.name is UNIQUE); rows are never deleted
+        self._city_ids: Dict[str, int] = {}
         self.init_database()
         
     def init_database(self):
@@ -16,389 +129,567 @@ class DatabaseManager:
             with open('database/schema.sql', 'r') as f:
                 schema = f.read()
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.executescript(schema)
-                conn.commit()
+            conn = self.get_connection()
+            conn.executescript(schema)
+            
+            # Databases created before is_job_candidate existed keep their old messages table
+            message_columns = [row[1] for row in conn.execute("PRAGMA table_info(messages)")]
+            if 'is_job_candidate' not in message_columns:
+                with self.transaction():
+                    conn.execute("ALTER TABLE messages ADD COLUMN is_job_candidate INTEGER DEFAULT 0")
+                    conn.execute("UPDATE messages SET is_job_candidate = is_job_candidate(message_text)")
+                logging.info("Added and backfilled messages.is_job_candidate")
+            
+            # INSERT OR IGNORE relies on one row per (group_id, message_id); older databases may hold duplicates
+            has_unique_index = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_messages_group_message'"
+            ).fetchone()
+            if not has_unique_index:
+                with self.transaction():
+                    removed = conn.execute("""
+                        DELETE FROM messages
+                        WHERE id NOT IN (SELECT MIN(id) FROM messages GROUP BY group_id, message_id)
+                    """).rowcount
+                    conn.execute("CREATE UNIQUE INDEX idx_messages_group_message ON messages(group_id, message_id)")
+                if removed:
+                    logging.info(f"Removed {removed} duplicate messages")
+            
             logging.info("Database initialized successfully")
         except Exception as e:
             logging.error(f"Error initializing database: {e}")
             raise
     
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's persistent connection, opening it with performance PRAGMAs on first use.
+        The connection is in autocommit mode; group writes with transaction()."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.executescript(CONNECTION_PRAGMAS)
+            # Lets SQL statements apply the same keyword pre-check as inserts do
+            conn.create_function("is_job_candidate", 1, is_job_candidate, deterministic=True)
+        return conn
+    
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed writes in one transaction, committed once on exit.
+        Nested calls join the outer transaction, so several inserts share a single commit:
+            
+            with db.transaction():
+                for message in messages:
+                    db.insert_message(message)
+        """
+        conn = self.get_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            # A failed COMMIT leaves the transaction open, so it is rolled back too
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # Cities inserted by the rolled back transaction no longer exist
+            self._city_ids.clear()
+            raise
+    
+    def get_read_only_connection(self):
+        """Get this thread's read-only connection for polling reads that must never block writers"""
+        conn = getattr(self._local, 'ro_conn', None)
+        if conn is None:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = self._local.ro_conn = sqlite3.connect(uri, uri=True)
+            conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+    
+    def close(self):
+        """Close the connections opened by the current thread"""
+        for attr in ('conn', 'ro_conn'):
+            conn = getattr(self._local, attr, None)
+            if conn is not None:
+                conn.close()
+                setattr(self._local, attr, None)
     
     def insert_city(self, name: str, state: str = None, country: str = "India") -> int:
-        """Insert a new city and return its ID"""
-        with self.get_connection() as conn:
+        """Insert a new city and return its ID, or the ID of the city already stored under that name"""
+        city_id = self._city_ids.get(name)
+        if city_id is not None:
+            return city_id
+        
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR IGNORE INTO cities (name, state, country) VALUES (?, ?, ?)",
-                (name, state, country)
-            )
-            conn.commit()
-            return cursor.lastrowid
+            # The no-op DO UPDATE makes RETURNING yield the existing row's ID on a name clash
+            cursor.execute("""
+                INSERT INTO cities (name, state, country) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET name = excluded.name
+                RETURNING id
+            """, (name, state, country))
+            city_id = cursor.fetchone()[0]
+        
+        self._city_ids[name] = city_id
+        return city_id
+    
+    def insert_cities_bulk(self, names: List[str], state: str = None, country: str = "India"):
+        """Insert many cities in a single transaction"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(_SQL_INSERT_CITY, [(name, state, country) for name in names])
     
     def insert_programming_group(self, group_data: Dict[str, Any]) -> int:
         """Insert a new programming group and return its ID"""
-        with self.get_connection() as conn:
+        return self.insert_programming_groups_bulk([group_data]).get(group_data['group_link'], 0)
+    
+    def insert_programming_groups_bulk(self, groups: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert many programming groups in a single transaction.
+        Returns group IDs keyed by group_link, including groups that were already stored."""
+        if not groups:
+            return {}
+        
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR IGNORE INTO programming_groups 
-                (group_name, group_link, group_id, city_id, source_type, credibility_score, joined_by_account)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                group_data['group_name'],
-                group_data['group_link'],
-                group_data.get('group_id'),
-                group_data.get('city_id'),
-                group_data.get('source_type', 'telegram'),
-                group_data.get('credibility_score', 0.0),
-                group_data.get('joined_by_account')
-            ))
-            conn.commit()
-            return cursor.lastrowid
+            cursor.executemany(_SQL_INSERT_PROGRAMMING_GROUP, [_programming_group_row(group_data) for group_data in groups])
+            
+            # Resolve IDs of new and existing groups in one query
+            cursor.execute(_SQL_GROUP_IDS_BY_LINK, (json.dumps([group_data['group_link'] for group_data in groups]),))
+            return dict(cursor.fetchall())
     
     def insert_account_group_assignment(self, account_name: str, group_id: int, assignment_date: str = None) -> int:
-        """Insert account-group assignment"""
+        """Insert account-group assignment and return its ID, or the ID of the identical stored one"""
         if assignment_date is None:
             assignment_date = datetime.now().date().isoformat()
             
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT OR IGNORE INTO account_group_assignments 
+                INSERT INTO account_group_assignments 
                 (account_name, group_id, assignment_date)
                 VALUES (?, ?, ?)
+                ON CONFLICT(account_name, group_id, assignment_date) DO UPDATE SET account_name = excluded.account_name
+                RETURNING id
             """, (account_name, group_id, assignment_date))
-            conn.commit()
-            return cursor.lastrowid
+            return cursor.fetchone()[0]
     
-    def get_groups_by_account(self, account_name: str, date: str = None) -> List[Dict[str, Any]]:
-        """Get all groups joined by a specific account"""
-        with self.get_connection() as conn:
+    def bulk_insert_groups_and_assignments(self, groups: List[Dict[str, Any]], account_name: str,
+                                           assignment_date: str = None) -> Dict[str, int]:
+        """Insert groups joined by one account and their assignments in a single transaction.
+        Returns group IDs keyed by group_link, including groups that were already stored."""
+        if not groups:
+            return {}
+        
+        if assignment_date is None:
+            assignment_date = datetime.now().date().isoformat()
+        
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            if date:
-                cursor.execute("""
-                    SELECT pg.*, aga.assignment_date
-                    FROM programming_groups pg
-                    JOIN account_group_assignments aga ON pg.id = aga.group_id
-                    WHERE aga.account_name = ? AND aga.assignment_date = ?
-                    ORDER BY aga.assignment_date DESC
-                """, (account_name, date))
-            else:
-                cursor.execute("""
-                    SELECT pg.*, aga.assignment_date
-                    FROM programming_groups pg
-                    JOIN account_group_assignments aga ON pg.id = aga.group_id
-                    WHERE aga.account_name = ?
-                    ORDER BY aga.assignment_date DESC
-                """, (account_name,))
+            cursor.executemany(_SQL_INSERT_PROGRAMMING_GROUP, [_programming_group_row(group_data) for group_data in groups])
             
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            # Resolve IDs of new and existing groups in one query
+            cursor.execute(_SQL_GROUP_IDS_BY_LINK, (json.dumps([group_data['group_link'] for group_data in groups]),))
+            group_ids = dict(cursor.fetchall())
+            
+            cursor.executemany(_SQL_INSERT_ASSIGNMENT, [(account_name, group_id, assignment_date) for group_id in group_ids.values()])
+            return group_ids
     
-    def get_account_group_summary(self) -> Dict[str, Any]:
-        """Get summary of which account joined which groups"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+    def get_groups_by_account(self, account_name: str, date: str = None) -> List[Dict[str, Any]]:
+        """Get all groups joined by a specific account"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if date:
             cursor.execute("""
-                SELECT 
-                    aga.account_name,
-                    COUNT(DISTINCT aga.group_id) as total_groups,
-                    COUNT(DISTINCT aga.assignment_date) as active_days,
-                    MAX(aga.assignment_date) as last_assignment
-                FROM account_group_assignments aga
-                GROUP BY aga.account_name
-                ORDER BY aga.account_name
-            """)
-            
-            columns = [description[0] for description in cursor.description]
-            summary = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            
-            # Get detailed breakdown
+                SELECT pg.*, aga.assignment_date
+                FROM programming_groups pg
+                JOIN account_group_assignments aga ON pg.id = aga.group_id
+                WHERE aga.account_name = ? AND aga.assignment_date = ?
+                ORDER BY aga.assignment_date DESC
+            """, (account_name, date))
+        else:
             cursor.execute("""
-                SELECT 
-                    aga.account_name,
-                    aga.assignment_date,
-                    COUNT(aga.group_id) as groups_joined
-                FROM account_group_assignments aga
-                GROUP BY aga.account_name, aga.assignment_date
-                ORDER BY aga.account_name, aga.assignment_date DESC
-            """)
-            
-            columns = [description[0] for description in cursor.description]
-            daily_breakdown = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            
-            return {
-                "summary": summary,
-                "daily_breakdown": daily_breakdown
-            }
+                SELECT pg.*, aga.assignment_date
+                FROM programming_groups pg
+                JOIN account_group_assignments aga ON pg.id = aga.group_id
+                WHERE aga.account_name = ?
+                ORDER BY aga.assignment_date DESC
+            """, (account_name,))
+        
+        return _rows_as_dicts(cursor)
+    
+    def get_account_group_summary(self) -> Dict[str, Any]:
+        """Get summary of which account joined which groups"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                aga.account_name,
+                COUNT(DISTINCT aga.group_id) as total_groups,
+                COUNT(DISTINCT aga.assignment_date) as active_days,
+                MAX(aga.assignment_date) as last_assignment
+            FROM account_group_assignments aga
+            GROUP BY aga.account_name
+            ORDER BY total_groups DESC
+        """)
+        
+        summary = _rows_as_dicts(cursor)
+        
+        # Get detailed breakdown
+        cursor.execute("""
+            SELECT 
+                aga.account_name,
+                aga.assignment_date,
+                COUNT(aga.group_id) as groups_joined
+            FROM account_group_assignments aga
+            GROUP BY aga.account_name, aga.assignment_date
+            ORDER BY aga.account_name, aga.assignment_date DESC
+        """)
+        
+        daily_breakdown = _rows_as_dicts(cursor)
+        
+        return {
+            "summary": summary,
+            "daily_breakdown": daily_breakdown
+        }
     
     def get_unique_groups_per_account(self, date: str = None) -> Dict[str, List[str]]:
         """Get unique groups assigned to each account"""
         if date is None:
             date = datetime.now().date().isoformat()
             
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    aga.account_name,
-                    GROUP_CONCAT(pg.group_name, ', ') as group_names,
-                    GROUP_CONCAT(pg.group_link, ', ') as group_links
-                FROM account_group_assignments aga
-                JOIN programming_groups pg ON aga.group_id = pg.id
-                WHERE aga.assignment_date = ?
-                GROUP BY aga.account_name
-            """, (date,))
-            
-            result = {}
-            for row in cursor.fetchall():
-                account_name, group_names, group_links = row
-                result[account_name] = {
-                    "groups": group_names.split(', ') if group_names else [],
-                    "links": group_links.split(', ') if group_links else []
-                }
-            
-            return result
-    
-    def insert_message(self, message_data: Dict[str, Any]) -> int:
-        """Insert a new message and return its ID"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR IGNORE INTO messages 
-                (group_id, message_id, sender_id, sender_name, message_text, timestamp, is_job_post, fetched_by_account)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                message_data['group_id'],
-                message_data['message_id'],
-                message_data.get('sender_id'),
-                message_data.get('sender_name'),
-                message_data['message_text'],
-                message_data.get('timestamp'),
-                message_data.get('is_job_post', False),
-                message_data.get('fetched_by_account')
-            ))
-            conn.commit()
-            return cursor.lastrowid
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                aga.account_name,
+                json_group_array(pg.group_name) as group_names,
+                json_group_array(pg.group_link) as group_links
+            FROM account_group_assignments aga
+            JOIN programming_groups pg ON aga.group_id = pg.id
+            WHERE aga.assignment_date = ?
+            GROUP BY aga.account_name
+        """, (date,))
+        
+        # JSON arrays keep group names that contain ", " intact
+        return {
+            account_name: {
+                "groups": json.loads(group_names),
+                "links": json.loads(group_links)
+            }
+            for account_name, group_names, group_links in cursor.fetchall()
+        }
     
     def insert_job_score(self, job_score_data: Dict[str, Any]) -> int:
         """Insert job score data and return its ID"""
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            tags_json = json.dumps(job_score_data.get('tags', []))
-            cursor.execute("""
-                INSERT INTO job_scores 
-                (message_id, salary_score, contact_score, website_score, name_score, 
-                 skill_score, experience_score, location_score, remote_score, 
-                 fresher_friendly_score, overall_score, tags)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                job_score_data['message_id'],
-                job_score_data.get('salary_score', 0.0),
-                job_score_data.get('contact_score', 0.0),
-                job_score_data.get('website_score', 0.0),
-                job_score_data.get('name_score', 0.0),
-                job_score_data.get('skill_score', 0.0),
-                job_score_data.get('experience_score', 0.0),
-                job_score_data.get('location_score', 0.0),
-                job_score_data.get('remote_score', 0.0),
-                job_score_data.get('fresher_friendly_score', 0.0),
-                job_score_data.get('overall_score', 0.0),
-                tags_json
-            ))
-            conn.commit()
+            cursor.execute(_SQL_INSERT_JOB_SCORE, _job_score_row(job_score_data))
             return cursor.lastrowid
     
+    def insert_job_scores_bulk(self, job_scores: List[Dict[str, Any]]):
+        """Insert many job scores in a single transaction"""
+        if not job_scores:
+            return
+        
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(_SQL_INSERT_JOB_SCORE, [_job_score_row(job_score_data) for job_score_data in job_scores])
+    
     def get_cities(self) -> List[Dict[str, Any]]:
         """Get all cities"""
-        with self.get_connection() as conn:
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM cities ORDER BY name")
+        return _rows_as_dicts(cursor)
+    
+    def get_cached_search_results(self, city: str, language: str = None, max_age_hours: int = 24) -> Optional[List[Dict[str, Any]]]:
+        """Get cached search results for a city/language if they are fresh enough"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT results FROM search_cache 
+            WHERE city = ? AND language = ? AND cached_at >= datetime('now', ?)
+        """, (city, language or '', f'-{max_age_hours} hours'))
+        row = cursor.fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def cache_search_results(self, city: str, language: str, results: List[Dict[str, Any]]):
+        """Store search results for a city/language, replacing older ones"""
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM cities ORDER BY name")
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            cursor.execute("""
+                INSERT OR REPLACE INTO search_cache (city, language, results, cached_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            """, (city, language or '', json.dumps(results)))
     
     def get_programming_groups(self, city_id: int = None, limit: int = None, account_name: str = None) -> List[Dict[str, Any]]:
         """Get programming groups, optionally filtered by city or account"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            if account_name:
-                cursor.execute("""
-                    SELECT pg.* FROM programming_groups pg
-                    JOIN account_group_assignments aga ON pg.id = aga.group_id
-                    WHERE aga.account_name = ? AND pg.is_active = 1
-                    ORDER BY pg.credibility_score DESC
-                """, (account_name,))
-            elif city_id:
-                cursor.execute("""
-                    SELECT * FROM programming_groups 
-                    WHERE city_id = ? AND is_active = 1
-                    ORDER BY credibility_score DESC
-                """, (city_id,))
-            else:
-                cursor.execute("""
-                    SELECT * FROM programming_groups 
-                    WHERE is_active = 1
-                    ORDER BY credibility_score DESC
-                """)
-            
-            columns = [description[0] for description in cursor.description]
-            rows = cursor.fetchall()
-            if limit:
-                rows = rows[:limit]
-            return [dict(zip(columns, row)) for row in rows]
+        if account_name:
+            query = """
+                SELECT pg.* FROM programming_groups pg
+                JOIN account_group_assignments aga ON pg.id = aga.group_id
+                WHERE aga.account_name = ? AND pg.is_active = 1
+                ORDER BY pg.credibility_score DESC
+            """
+            params = [account_name]
+        elif city_id:
+            query = """
+                SELECT * FROM programming_groups 
+                WHERE city_id = ? AND is_active = 1
+                ORDER BY credibility_score DESC
+            """
+            params = [city_id]
+        else:
+            query = """
+                SELECT * FROM programming_groups 
+                WHERE is_active = 1
+                ORDER BY credibility_score DESC
+            """
+            params = []
+        
+        # Let SQLite stop after the top rows instead of fetching and slicing them all
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        return _rows_as_dicts(cursor)
     
-    def get_messages(self, group_id: int, limit: int = 200, account_name: str = None) -> List[Dict[str, Any]]:
-        """Get messages from a specific group, optionally filtered by account"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            if account_name:
-                cursor.execute("""
-                    SELECT * FROM messages 
-                    WHERE group_id = ? AND fetched_by_account = ?
-                    ORDER BY timestamp DESC 
-                    LIMIT ?
-                """, (group_id, account_name, limit))
-            else:
+    def _query_messages(self, group_id: int, limit: int, account_name: str = None) -> sqlite3.Cursor:
+        """Run the newest-first messages query for a group and return the open cursor"""
+        cursor = self.get_connection().cursor()
+        
+        if account_name:
+            cursor.execute("""
+                SELECT * FROM messages 
+                WHERE group_id = ? AND fetched_by_account = ?
+                ORDER BY timestamp DESC 
+                LIMIT ?
+            """, (group_id, account_name, limit))
+        else:
             cursor.execute("""
                 SELECT * FROM messages 
                 WHERE group_id = ? 
                 ORDER BY timestamp DESC 
                 LIMIT ?
             """, (group_id, limit))
-            
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return cursor
+    
+    def get_messages(self, group_id: int, limit: int = 200, account_name: str = None) -> List[Dict[str, Any]]:
+        """Get messages from a specific group, optionally filtered by account"""
+        cursor = self._query_messages(group_id, limit, account_name)
+        return _rows_as_dicts(cursor)
+    
+    def iter_messages(self, group_id: int, limit: int = 200, account_name: str = None) -> Iterator[Dict[str, Any]]:
+        """Stream messages from a specific group one row at a time instead of building a list"""
+        cursor = self._query_messages(group_id, limit, account_name)
+        columns = [description[0] for description in cursor.description]
+        for row in cursor:
+            yield dict(zip(columns, row))
+    
+    def get_messages_columnar(self, group_id: int, limit: int = 200, account_name: str = None) -> Dict[str, List[Any]]:
+        """Get messages from a specific group as one list per column, for loops that work on whole columns"""
+        cursor = self._query_messages(group_id, limit, account_name)
+        columns = [description[0] for description in cursor.description]
+        rows = cursor.fetchall()
+        if not rows:
+            return {column: [] for column in columns}
+        # zip(*rows) transposes in C instead of indexing every row per column
+        return {column: list(values) for column, values in zip(columns, zip(*rows))}
+    
+    def get_message_ids(self, group_id: int) -> Set[str]:
+        """Get the Telegram message IDs already stored for a group"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT message_id FROM messages WHERE group_id = ?", (group_id,))
+        return {str(row[0]) for row in cursor.fetchall()}
     
     def update_group_credibility(self, group_id: int, credibility_score: float):
         """Update the credibility score of a group"""
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE programming_groups 
                 SET credibility_score = ? 
                 WHERE id = ?
             """, (credibility_score, group_id))
-            conn.commit()
+    
+    def update_group_credibility_scores(self, min_messages: int = 100, sample_size: int = 100) -> List[Dict[str, Any]]:
+        """Score every active group from its latest messages in one UPDATE and return the scored groups"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                WITH recent AS (
+                    SELECT group_id, is_job_candidate,
+                           ROW_NUMBER() OVER (PARTITION BY group_id ORDER BY timestamp DESC) AS rn
+                    FROM messages
+                ),
+                stats AS (
+                    SELECT group_id, SUM(is_job_candidate) AS job_messages, COUNT(*) AS total
+                    FROM recent
+                    WHERE rn <= ?
+                    GROUP BY group_id
+                    HAVING COUNT(*) >= ?
+                )
+                UPDATE programming_groups
+                SET credibility_score = MIN(10.0, (stats.job_messages * 5.0 + stats.job_messages * 3.0) / stats.total)
+                FROM stats
+                WHERE programming_groups.id = stats.group_id AND programming_groups.is_active = 1
+                RETURNING id, group_name, joined_by_account, credibility_score
+            """, (sample_size, min_messages))
+            scored_groups = _rows_as_dicts(cursor)
+            return scored_groups
+    
+    def refresh_job_candidates(self) -> int:
+        """Recompute is_job_candidate for stored messages, e.g. after SCORING_JOB_KEYWORDS changed.
+        Runs as one UPDATE so message texts never leave SQLite; returns the number of changed rows."""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE messages 
+                SET is_job_candidate = is_job_candidate(message_text)
+                WHERE is_job_candidate IS NOT is_job_candidate(message_text)
+            """)
+            return cursor.rowcount
     
     def update_group_message_count(self, group_id: int, count: int):
         """Update the total message count of a group"""
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE programming_groups 
                 SET total_messages = ? 
                 WHERE id = ?
             """, (count, group_id))
-            conn.commit()
     
     def get_high_score_groups(self, threshold: float = 7.0) -> List[Dict[str, Any]]:
         """Get groups with high credibility scores"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM programming_groups 
-                WHERE credibility_score >= ? AND is_active = 1
-                ORDER BY credibility_score DESC
-            """, (threshold,))
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        conn = self.get_read_only_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT * FROM programming_groups 
+            WHERE credibility_score >= ? AND is_active = 1
+            ORDER BY credibility_score DESC
+        """, (threshold,))
+        return _rows_as_dicts(cursor)
+    
+    def _query_fresher_friendly_jobs(self, limit: int) -> sqlite3.Cursor:
+        """Run the best-first fresher-friendly jobs query and return the open cursor"""
+        cursor = self.get_connection().cursor()
+        cursor.execute("""
+            SELECT m.*, js.*, pg.group_name, pg.group_link
+            FROM messages m
+            JOIN job_scores js ON m.id = js.message_id
+            JOIN programming_groups pg ON m.group_id = pg.id
+            WHERE js.fresher_friendly_score >= 7.0
+            AND js.overall_score >= 7.0
+            ORDER BY js.overall_score DESC
+            LIMIT ?
+        """, (limit,))
+        return cursor
     
     def get_fresher_friendly_jobs(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get fresher-friendly jobs with high scores"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT m.*, js.*, pg.group_name, pg.group_link
-                FROM messages m
-                JOIN job_scores js ON m.id = js.message_id
-                JOIN programming_groups pg ON m.group_id = pg.id
-                WHERE js.fresher_friendly_score >= 7.0
-                AND js.overall_score >= 7.0
-                ORDER BY js.overall_score DESC
-                LIMIT ?
-            """, (limit,))
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        cursor = self._query_fresher_friendly_jobs(limit)
+        return _rows_as_dicts(cursor)
+    
+    def iter_fresher_friendly_jobs(self, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Stream fresher-friendly jobs one row at a time instead of building a list"""
+        cursor = self._query_fresher_friendly_jobs(limit)
+        columns = [description[0] for description in cursor.description]
+        for row in cursor:
+            yield dict(zip(columns, row))
     
     def get_messages_by_account(self, account_name: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get all messages fetched by a specific account"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT m.*, pg.group_name, pg.group_link
-                FROM messages m
-                JOIN programming_groups pg ON m.group_id = pg.id
-                WHERE m.fetched_by_account = ?
-                ORDER BY m.timestamp DESC
-                LIMIT ?
-            """, (account_name, limit))
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()] 
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT m.*, pg.group_name, pg.group_link
+            FROM messages m
+            JOIN programming_groups pg ON m.group_id = pg.id
+            WHERE m.fetched_by_account = ?
+            ORDER BY m.timestamp DESC
+            LIMIT ?
+        """, (account_name, limit))
+        return _rows_as_dicts(cursor)
+    
     def insert_message(self, message_data: Dict[str, Any]) -> int:
-        """Insert a new message into the database"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR IGNORE INTO messages 
-                (group_id, message_id, sender_id, sender_name, message_text, 
-                 timestamp, is_job_post, job_score, fetched_by_account)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                message_data.get('group_id'),
-                message_data.get('message_id'),
+        """Insert a new message into the database and return its ID"""
+        key = (message_data.get('group_id'), str(message_data.get('message_id')))
+        return self.insert_messages_bulk([message_data]).get(key, 0)
+
+    def insert_messages_bulk(self, messages: List[Dict[str, Any]]) -> Dict[Tuple[int, str], int]:
+        """Insert messages in a single transaction and return row IDs keyed by (group_id, message_id).
+        Messages without a message_id cannot be deduplicated or looked up again, so they are skipped."""
+        rows = []
+        message_ids_by_group = {}
+        for message_data in messages:
+            message_id = message_data.get('message_id')
+            if message_id is None or message_id == '':
+                logging.warning(f"Skipping message without message_id in group {message_data.get('group_id')}")
+                continue
+            
+            group_id = message_data.get('group_id')
+            rows.append((
+                group_id,
+                message_id,
                 message_data.get('sender_id'),
                 message_data.get('sender_name'),
                 message_data.get('message_text'),
                 message_data.get('timestamp'),
                 message_data.get('is_job_post', False),
                 message_data.get('job_score', 0.0),
+                is_job_candidate(message_data.get('message_text')),
                 message_data.get('fetched_by_account')
             ))
-            conn.commit()
-            return cursor.lastrowid
-
-    def get_account_group_summary(self) -> Dict[str, Any]:
-        """Get summary of account-group assignments"""
-        with self.get_connection() as conn:
+            message_ids_by_group.setdefault(group_id, []).append(str(message_id))
+        
+        if not rows:
+            return {}
+        
+        row_ids = {}
+        with self.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    aga.account_name,
-                    COUNT(DISTINCT aga.group_id) as total_groups,
-                    COUNT(DISTINCT aga.assignment_date) as active_days,
-                    MAX(aga.assignment_date) as last_assignment
-                FROM account_group_assignments aga
-                GROUP BY aga.account_name
-                ORDER BY total_groups DESC
-            """)
-            
-            summary = []
-            for row in cursor.fetchall():
-                summary.append({
-                    'account_name': row[0],
-                    'total_groups': row[1],
-                    'active_days': row[2],
-                    'last_assignment': row[3]
-                })
+            cursor.executemany(_SQL_INSERT_MESSAGE, rows)
             
-            return {'summary': summary}
+            # Resolve row IDs of inserted and already stored messages with one query per group
+            for group_id, message_ids in message_ids_by_group.items():
+                cursor.execute(_SQL_MESSAGE_IDS_BY_TELEGRAM_ID, (group_id, json.dumps(message_ids)))
+                for message_id, row_id in cursor.fetchall():
+                    row_ids[(group_id, str(message_id))] = row_id
+        return row_ids
 
     def get_groups_joined_today(self, date: str) -> List[Dict[str, Any]]:
         """Get groups joined today by any account"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT DISTINCT group_id 
-                FROM account_group_assignments 
-                WHERE assignment_date = ?
-            """, (date,))
-            
-            return [{'group_id': row[0]} for row in cursor.fetchall()]
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT group_id 
+            FROM account_group_assignments 
+            WHERE assignment_date = ?
+        """, (date,))
+        
+        return [{'group_id': row[0]} for row in cursor.fetchall()]
+
+    def get_group_links_joined_on(self, date: str, account_name: str = None) -> Set[str]:
+        """Get links of groups assigned on a date, optionally for one account only"""
+        query = """
+            SELECT pg.group_link 
+            FROM account_group_assignments aga
+            JOIN programming_groups pg ON pg.id = aga.group_id
+            WHERE aga.assignment_date = ?
+        """
+        params = [date]
+        if account_name:
+            query += " AND aga.account_name = ?"
+            params.append(account_name)
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        return {row[0] for row in cursor.fetchall()}
 
     def get_all_groups(self) -> List[Dict[str, Any]]:
         """Get all available groups from universal group manager"""
@@ -50,6 +50,7 @@ CREATE TABLE IF NOT EXISTS messages (
     timestamp TIMESTAMP,
     is_job_post BOOLEAN DEFAULT FALSE,
     job_score REAL DEFAULT 0.0,
+    is_job_candidate INTEGER DEFAULT 0, -- Keyword pre-check used for group scoring
     fetched_by_account TEXT, -- Track which account fetched this message
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (group_id) REFERENCES programming_groups (id)
@@ -107,11 +108,26 @@ CREATE TABLE IF NOT EXISTS email_notifications (
     status TEXT DEFAULT 'pending' -- pending, sent, failed
 );
 
+-- Cached search engine results per (city, language) to skip repeat API calls
+CREATE TABLE IF NOT EXISTS search_cache (
+    city TEXT NOT NULL,
+    language TEXT NOT NULL DEFAULT '',
+    results TEXT NOT NULL, -- JSON list of search results
+    cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (city, language)
+);
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_programming_groups_city ON programming_groups(city_id);
 CREATE INDEX IF NOT EXISTS idx_programming_groups_account ON programming_groups(joined_by_account);
+CREATE INDEX IF NOT EXISTS idx_programming_groups_active_score ON programming_groups(is_active, credibility_score DESC);
 CREATE INDEX IF NOT EXISTS idx_messages_group ON messages(group_id);
 CREATE INDEX IF NOT EXISTS idx_messages_account ON messages(fetched_by_account);
+CREATE INDEX IF NOT EXISTS idx_messages_group_timestamp ON messages(group_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_messages_group_account_timestamp ON messages(group_id, fetched_by_account, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_messages_account_timestamp ON messages(fetched_by_account, timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_job_scores_message ON job_scores(message_id);
+CREATE INDEX IF NOT EXISTS idx_job_scores_fresher_overall ON job_scores(overall_score DESC) WHERE fresher_friendly_score >= 7.0;
 CREATE INDEX IF NOT EXISTS idx_crawler_status_group ON crawler_status(group_id); 
-CREATE INDEX IF NOT EXISTS idx_account_group_assignments ON account_group_assignments(account_name, assignment_date); 
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_account_group_assignments ON account_group_assignments(account_name, assignment_date);
+CREATE INDEX IF NOT EXISTS idx_account_group_assignments_date ON account_group_assignments(assignment_date, account_name, group_id);
\ No newline at end of file
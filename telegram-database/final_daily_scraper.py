@@ -264,6 +264,8 @@ class FinalDailyJobScraper:
         self.logger.info(f"🔗 {account_name}: Simulating joining {len(groups)} groups")
         
         joined_groups = []
+        # All assignments of this batch share one date
+        assignment_date = datetime.now().date().isoformat()
         
         for group in groups:
             try:
@@ -282,7 +284,7 @@ class FinalDailyJobScraper:
                 group_db_id = self.db.insert_programming_group(group_data)
                 
                 # Record assignment
-                self.db.insert_account_group_assignment(account_name, group_db_id)
+                self.db.insert_account_group_assignment(account_name, group_db_id, assignment_date)
                 
                 joined_groups.append({
                     'id': group_db_id,
@@ -410,7 +412,7 @@ class FinalDailyJobScraper:
                 # Store message in database
                 message_data = {
                     'group_id': group['id'],
-                    'message_id': message.get('id', ''),
+                    'message_id': message.get('id'),
                     'sender_id': message.get('sender', ''),
                     'sender_name': message.get('sender', ''),
                     'message_text': message_text,
@@ -420,13 +422,14 @@ class FinalDailyJobScraper:
                     'fetched_by_account': account_name
                 }
                 
-                # Insert message into database
-                self.db.insert_message(message_data)
                 stored_messages.append(message_data)
                 
                 if is_job:
                     job_count += 1
         
+        # Store all messages of the group in one transaction
+        self.db.insert_messages_bulk(stored_messages)
+        
         # Calculate job percentage
         total_messages = len(messages)
         job_percentage = (job_count / total_messages * 100) if total_messages > 0 else 0.0
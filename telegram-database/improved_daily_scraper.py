@@ -55,6 +55,12 @@ class GroupTracker:
             )
         ''')
         
+        # Lets the all-accounts exporter read groups in ORDER BY order without a sort
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_groups_acct_jobs
+            ON groups(joined_by_account, job_messages DESC)
+        ''')
+        
         # Daily joins tracking
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS daily_joins (
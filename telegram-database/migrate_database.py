@@ -8,6 +8,8 @@ import logging
 import os
 from datetime import datetime
 
+from database.database import DatabaseManager
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -93,8 +95,12 @@ def migrate_database():
             logging.info("✅ Created indexes")
             
             conn.commit()
-            logging.info("🎉 Database migration completed successfully!")
-            
+        
+        # init_database adds and backfills is_job_candidate and deduplicates messages
+        # before creating idx_messages_group_message, exactly as on a normal start
+        DatabaseManager(db_path).close()
+        logging.info("🎉 Database migration completed successfully!")
+        
     except Exception as e:
         logging.error(f"❌ Database migration failed: {e}")
         raise
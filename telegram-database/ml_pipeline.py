@@ -6,6 +6,29 @@ import openai
 import config
 from database.database import DatabaseManager
 
+# Scoring runs these on every message, so compile them once instead of going
+# through re's pattern cache on each call
+_SALARY_AMOUNT_RE = re.compile(r'\d+[kkl]')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'\+?\d{10,}')
+_URL_RE = re.compile(r'https?://[^\s]+')
+_COMPANY_SUFFIX_RE = re.compile(r'(inc|corp|llc|ltd|pvt|company)')
+_YEAR_RANGE_RE = re.compile(r'\d+[-+]\d+')
+
+# Tried in order; the first pattern that matches wins
+_EXPERIENCE_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\d+[-+]\d+\s*years?',
+    r'fresher',
+    r'entry\s*level',
+    r'junior',
+    r'senior'
+))
+_SALARY_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\d+[kkl]\s*per\s*annum',
+    r'\d+[kkl]\s*lpa',
+    r'\d+[kkl]\s*ctc'
+))
+
 class MLPipeline:
     def __init__(self):
         self.db = DatabaseManager()
@@ -156,7 +179,7 @@ class MLPipeline:
             score += 4.0
         
         # Check for specific salary ranges
-        if re.search(r'\d+[kkl]', text):
+        if _SALARY_AMOUNT_RE.search(text):
             score += 3.0
         
         return min(score, 10.0)
@@ -174,7 +197,7 @@ class MLPipeline:
             score += 4.0
         
         # Check for email patterns
-        if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
+        if _EMAIL_RE.search(text):
             score += 3.0
         
         return min(score, 10.0)
@@ -192,7 +215,7 @@ class MLPipeline:
             score += 4.0
         
         # Check for URL patterns
-        if re.search(r'https?://[^\s]+', text):
+        if _URL_RE.search(text):
             score += 3.0
         
         return min(score, 10.0)
@@ -205,7 +228,7 @@ class MLPipeline:
             score += 5.0
         
         # Check for company indicators
-        if re.search(r'(inc|corp|llc|ltd|pvt|company)', text):
+        if _COMPANY_SUFFIX_RE.search(text):
             score += 3.0
         
         # Check for job title
@@ -245,7 +268,7 @@ class MLPipeline:
             score += 3.0
         
         # Check for specific year ranges
-        if re.search(r'\d+[-+]\d+', text):
+        if _YEAR_RANGE_RE.search(text):
             score += 3.0
         
         return min(score, 10.0)
@@ -325,16 +348,8 @@ class MLPipeline:
     
     def _extract_experience(self, text: str) -> str:
         """Extract experience requirement from text"""
-        experience_patterns = [
-            r'\d+[-+]\d+\s*years?',
-            r'fresher',
-            r'entry\s*level',
-            r'junior',
-            r'senior'
-        ]
-        
-        for pattern in experience_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _EXPERIENCE_RES:
+            match = pattern.search(text)
             if match:
                 return match.group()
         return ""
@@ -349,25 +364,16 @@ class MLPipeline:
     
     def _extract_salary(self, text: str) -> str:
         """Extract salary information from text"""
-        salary_patterns = [
-            r'\d+[kkl]\s*per\s*annum',
-            r'\d+[kkl]\s*lpa',
-            r'\d+[kkl]\s*ctc'
-        ]
-        
-        for pattern in salary_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _SALARY_RES:
+            match = pattern.search(text)
             if match:
                 return match.group()
         return ""
     
     def _extract_contact(self, text: str) -> str:
         """Extract contact information from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'\+?\d{10,}'
-        
-        email_match = re.search(email_pattern, text)
-        phone_match = re.search(phone_pattern, text)
+        email_match = _EMAIL_RE.search(text)
+        phone_match = _PHONE_RE.search(text)
         
         contact_info = []
         if email_match:
@@ -379,26 +385,15 @@ class MLPipeline:
     
     def _extract_website(self, text: str) -> str:
         """Extract website/application link from text"""
-        url_pattern = r'https?://[^\s]+'
-        match = re.search(url_pattern, text)
+        match = _URL_RE.search(text)
         return match.group() if match else ""
     
     def process_message(self, message_id: int, message_text: str) -> Dict[str, Any]:
         """Process a message through the ML pipeline"""
         try:
-            # Classify the message
-            classification = self.classify_message(message_text)
-            
-            # Score the message
-            scores = self.score_message(message_text, classification.get('extracted_data', {}))
+            job_score_data, scores, classification = self._build_job_score(message_id, message_text)
             
             # Store results in database
-            job_score_data = {
-                'message_id': message_id,
-                **scores,
-                'tags': self._generate_tags(scores, classification)
-            }
-            
             job_score_id = self.db.insert_job_score(job_score_data)
             
             # Store ML pipeline results
@@ -420,6 +415,34 @@ class MLPipeline:
             logging.error(f"Error processing message {message_id}: {e}")
             return {}
     
+    def process_messages(self, messages: List[Tuple[int, str]]) -> int:
+        """Process (message_id, message_text) pairs and store all their scores in one transaction"""
+        job_scores = []
+        for message_id, message_text in messages:
+            try:
+                job_score_data, _, _ = self._build_job_score(message_id, message_text)
+                job_scores.append(job_score_data)
+            except Exception as e:
+                logging.error(f"Error processing message {message_id}: {e}")
+        
+        self.db.insert_job_scores_bulk(job_scores)
+        return len(job_scores)
+    
+    def _build_job_score(self, message_id: int, message_text: str) -> Tuple[Dict[str, Any], Dict[str, float], Dict[str, Any]]:
+        """Classify and score a message, returning its job_scores row, the scores and the classification"""
+        # Classify the message
+        classification = self.classify_message(message_text)
+        
+        # Score the message
+        scores = self.score_message(message_text, classification.get('extracted_data', {}))
+        
+        job_score_data = {
+            'message_id': message_id,
+            **scores,
+            'tags': self._generate_tags(scores, classification)
+        }
+        return job_score_data, scores, classification
+    
     def _generate_tags(self, scores: Dict[str, float], classification: Dict[str, Any]) -> List[str]:
         """Generate tags based on scores and classification"""
         tags = []
@@ -309,7 +309,7 @@ class RealDailyJobScraper:
                 # Store message in database
                 message_data = {
                     'group_id': group['id'],
-                    'message_id': message.get('id', ''),
+                    'message_id': message.get('id'),
                     'sender_id': message.get('sender_id', ''),
                     'sender_name': message.get('sender', '') or message.get('sender_name', ''),
                     'message_text': message_text,
@@ -319,13 +319,14 @@ class RealDailyJobScraper:
                     'fetched_by_account': account_name
                 }
                 
-                # Insert message into database
-                self.db.insert_message(message_data)
                 stored_messages.append(message_data)
                 
                 if is_job:
                     job_count += 1
         
+        # Store all messages of the group in one transaction
+        self.db.insert_messages_bulk(stored_messages)
+        
         # Calculate job percentage
         total_messages = len(messages)
         job_percentage = (job_count / total_messages * 100) if total_messages > 0 else 0.0
@@ -171,6 +171,8 @@ class SimpleDailyJobScraper:
         # Select groups to join (up to 10)
         groups_to_join = available_groups[:self.groups_per_account]
         joined_groups = []
+        # All assignments of this batch share one date
+        assignment_date = datetime.now().date().isoformat()
         
         for group in groups_to_join:
             try:
@@ -189,7 +191,7 @@ class SimpleDailyJobScraper:
                 group_db_id = self.db.insert_programming_group(group_data)
                 
                 # Record assignment
-                self.db.insert_account_group_assignment(account_name, group_db_id)
+                self.db.insert_account_group_assignment(account_name, group_db_id, assignment_date)
                 
                 joined_groups.append({
                     'id': group_db_id,
@@ -287,7 +289,7 @@ class SimpleDailyJobScraper:
                 # Store message in database
                 message_data = {
                     'group_id': group['id'],
-                    'message_id': message.get('id', ''),
+                    'message_id': message.get('id'),
                     'sender_id': message.get('sender', ''),
                     'sender_name': message.get('sender', ''),
                     'message_text': message_text,
@@ -297,13 +299,14 @@ class SimpleDailyJobScraper:
                     'fetched_by_account': account['name']
                 }
                 
-                # Insert message into database
-                self.db.insert_message(message_data)
                 stored_messages.append(message_data)
                 
                 if is_job:
                     job_count += 1
         
+        # Store all messages of the group in one transaction
+        self.db.insert_messages_bulk(stored_messages)
+        
         # Calculate job percentage
         total_messages = len(messages)
         job_percentage = (job_count / total_messages * 100) if total_messages > 0 else 0.0
@@ -4,7 +4,6 @@ This ensures groups are permanently assigned to accounts
 """
 import uuid
 import logging
-from datetime import datetime
 from typing import List, Dict, Any, Optional
 from models.account import Account
 from models.group import Group
@@ -21,30 +20,29 @@ class PersistentAssignmentEngine:
     def assign_group_to_account(self, account_id: str, group_id: str) -> bool:
         """Permanently assign group to account"""
         try:
-            # Check if assignment already exists
-            existing = self.db.get_assignment(account_id, group_id)
-            if existing:
-                self.logger.warning(f"Assignment already exists: {account_id} -> {group_id}")
-                return True
-            
             # Create new assignment
             assignment = Assignment(
                 id=str(uuid.uuid4()),
                 account_id=account_id,
                 group_id=group_id,
-                assigned_at=datetime.now(),
+                assigned_at=None,  # Set by the database
                 status='active'
             )
             
-            # Save to database
-            success = self.db.create_assignment(assignment)
-            
-            if success:
-                # Log assignment history
-                self.log_assignment_action(account_id, group_id, 'joined', 'Initial assignment')
-                self.logger.info(f"Successfully assigned group {group_id} to account {account_id}")
-            
-            return success
+            # Save to database, committing the assignment and its history together.
+            # An assignment the account has left is reactivated instead of duplicated.
+            with self.db.transaction():
+                stored = self.db.create_assignment(assignment)
+                if stored is None:
+                    self.logger.warning(f"Assignment already exists: {account_id} -> {group_id}")
+                    return True
+                
+                # Log assignment history; a different ID means an existing assignment was reactivated
+                reason = 'Initial assignment' if stored.id == assignment.id else 'Reactivated assignment'
+                self.log_assignment_action(account_id, group_id, 'joined', reason)
+            
+            self.logger.info(f"Successfully assigned group {group_id} to account {account_id}")
+            return True
             
         except Exception as e:
             self.logger.error(f"Error assigning group {group_id} to account {account_id}: {e}")
@@ -53,12 +51,15 @@ class PersistentAssignmentEngine:
     def unassign_group_from_account(self, account_id: str, group_id: str, reason: str = "Manual unassignment") -> bool:
         """Remove assignment between account and group"""
         try:
-            # Update assignment status
-            success = self.db.update_assignment_status(account_id, group_id, 'left')
+            # Update assignment status, committing it and its history together
+            with self.db.transaction():
+                success = self.db.update_assignment_status(account_id, group_id, 'left')
+                
+                if success:
+                    # Log assignment history
+                    self.log_assignment_action(account_id, group_id, 'left', reason)
             
             if success:
-                # Log assignment history
-                self.log_assignment_action(account_id, group_id, 'left', reason)
                 self.logger.info(f"Successfully unassigned group {group_id} from account {account_id}")
             
             return success
@@ -109,15 +110,7 @@ class PersistentAssignmentEngine:
     def get_available_groups(self) -> List[Group]:
         """Get all groups that are not assigned to any account"""
         try:
-            all_groups = self.db.get_all_groups()
-            assigned_group_ids = self.db.get_all_assigned_group_ids()
-            
-            available_groups = [
-                group for group in all_groups 
-                if group.id not in assigned_group_ids
-            ]
-            
-            return available_groups
+            return self.db.get_unassigned_groups()
             
         except Exception as e:
             self.logger.error(f"Error getting available groups: {e}")
@@ -159,7 +152,7 @@ class PersistentAssignmentEngine:
                 account_id=account_id,
                 group_id=group_id,
                 action=action,
-                timestamp=datetime.now(),
+                timestamp=None,  # Set by the database
                 reason=reason
             )
             
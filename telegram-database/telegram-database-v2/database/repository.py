@@ -1,11 +1,15 @@
 """
 Database Repository - Handles all database operations
 """
+import asyncio
+import copy
 import sqlite3
-import uuid
+import threading
 import uuid
 import logging
+from collections import OrderedDict
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from contextlib import contextmanager
 
@@ -14,6 +18,85 @@ from models.group import Group
 from models.assignment import Assignment, AssignmentHistory
 from models.message import Message
 
+# WAL is stored in the database file, so it is switched on once in initialize();
+# every later connection opens in WAL mode and readers no longer block the writer.
+DATABASE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+"""
+
+# Per-connection settings: fewer fsyncs per commit, in-memory temp tables,
+# memory-mapped reads and a larger page cache; busy_timeout waits out short locks.
+CONNECTION_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-64000;
+    PRAGMA busy_timeout=5000;
+"""
+
+# Upper bound on cached accounts and groups per repository
+LOOKUP_CACHE_SIZE = 1024
+
+# Explicit column lists: reads fetch only what the models use, independent of table column order
+_ACCOUNT_COLUMNS = "id, name, phone, api_id, api_hash, session_name, status, created_at, updated_at"
+_GROUP_COLUMNS = "id, name, link, category, priority, credibility_score, total_members, created_at, updated_at"
+_ASSIGNMENT_COLUMNS = "id, account_id, group_id, assigned_at, status, last_message_fetch, total_messages_fetched"
+
+_SQL_GET_ACCOUNT = f"SELECT {_ACCOUNT_COLUMNS} FROM accounts WHERE id = ?"
+_SQL_ACTIVE_ACCOUNTS = f"SELECT {_ACCOUNT_COLUMNS} FROM accounts WHERE status = 'active'"
+_SQL_GET_GROUP = f"SELECT {_GROUP_COLUMNS} FROM groups WHERE id = ?"
+_SQL_ALL_GROUPS = f"SELECT {_GROUP_COLUMNS} FROM groups"
+_SQL_GROUPS_BY_PRIORITY = f"SELECT {_GROUP_COLUMNS} FROM groups WHERE priority = ?"
+_SQL_GROUPS_BY_CATEGORY = f"SELECT {_GROUP_COLUMNS} FROM groups WHERE category = ?"
+_SQL_UNASSIGNED_GROUPS = f"""
+    SELECT {_GROUP_COLUMNS} FROM groups
+    WHERE id NOT IN (SELECT group_id FROM persistent_assignments WHERE status = 'active')
+"""
+_SQL_GET_ASSIGNMENT = f"SELECT {_ASSIGNMENT_COLUMNS} FROM persistent_assignments WHERE account_id = ? AND group_id = ?"
+_SQL_ACTIVE_ASSIGNMENTS_BY_ACCOUNT = f"SELECT {_ASSIGNMENT_COLUMNS} FROM persistent_assignments WHERE account_id = ? AND status = 'active'"
+_SQL_ACTIVE_ASSIGNMENT_BY_GROUP = f"SELECT {_ASSIGNMENT_COLUMNS} FROM persistent_assignments WHERE group_id = ? AND status = 'active'"
+# assigned_at is stamped by SQLite in local time, matching the datetime.now() values already
+# stored; the CURRENT_TIMESTAMP column default would be UTC
+_SQL_UPSERT_ASSIGNMENT = f"""
+    INSERT INTO persistent_assignments (id, account_id, group_id, assigned_at, status)
+    VALUES (?, ?, ?, datetime('now', 'localtime'), ?)
+    ON CONFLICT(account_id, group_id) DO UPDATE SET status = excluded.status
+    WHERE persistent_assignments.status <> excluded.status
+    RETURNING {_ASSIGNMENT_COLUMNS}
+"""
+
+# Statements shared by the single-row and bulk write paths
+_SQL_INSERT_GROUP = """
+    INSERT INTO groups (id, name, link, category, priority, credibility_score, total_members)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Bulk loads re-run over the whole group list, so already stored links are skipped
+_SQL_INSERT_GROUP_IF_NEW = """
+    INSERT OR IGNORE INTO groups (id, name, link, category, priority, credibility_score, total_members)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# timestamp is stamped in local time, like assigned_at
+_SQL_INSERT_ASSIGNMENT_HISTORY = """
+    INSERT INTO assignment_history (id, account_id, group_id, action, timestamp, reason)
+    VALUES (?, ?, ?, ?, datetime('now', 'localtime'), ?)
+"""
+
+# Databases created while messages.id was a TEXT UUID are rebuilt once with integer rowid keys.
+# Nothing references messages by ID, so the rows are copied in their stored order with new IDs.
+_SQL_COPY_TEXT_ID_MESSAGES = """
+    INSERT INTO messages (group_id, account_id, message_text, timestamp, is_job_message, job_score)
+    SELECT group_id, account_id, message_text, timestamp, is_job_message, job_score
+    FROM messages_text_ids ORDER BY rowid;
+    DROP TABLE messages_text_ids;
+"""
+
+_SQL_INSERT_MESSAGE = """
+    INSERT INTO messages (id, group_id, account_id, message_text, timestamp, is_job_message, job_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
 class DatabaseRepository:
     """Repository for database operations"""
     
@@ -26,36 +109,196 @@ class DatabaseRepository:
             self.db_path = self.db_url.replace("sqlite:///", "")
         else:
             self.db_path = "telegram_jobs_v2.db"
+        
+        # One long-lived connection per thread keeps SQLite's page cache warm across calls
+        self._local = threading.local()
+        
+        # The async methods run their blocking sqlite3 calls on this single thread, so the
+        # event loop keeps serving Telegram I/O meanwhile and they all share one connection
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+        self._closed = False
+        
+        # LRU caches for the by-ID lookups made on almost every operation. Misses are not
+        # cached, and every write to accounts or groups pops the IDs it touches. Both the
+        # caller's thread and the database thread use them, so access goes through
+        # _cache_get/_cache_put/_cache_pop under _cache_lock, and callers get copies.
+        self._account_cache: "OrderedDict[str, Account]" = OrderedDict()
+        self._group_cache: "OrderedDict[str, Group]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    @staticmethod
+    def _group_from_row(row: sqlite3.Row) -> Group:
+        """Build a Group from a row selected with _GROUP_COLUMNS"""
+        return Group(
+            id=row['id'],
+            name=row['name'],
+            link=row['link'],
+            category=row['category'],
+            priority=row['priority'],
+            credibility_score=row['credibility_score'],
+            total_members=row['total_members'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
+        )
+    
+    @staticmethod
+    def _assignment_from_row(row: sqlite3.Row) -> Assignment:
+        """Build an Assignment from a row selected with _ASSIGNMENT_COLUMNS"""
+        return Assignment(
+            id=row['id'],
+            account_id=row['account_id'],
+            group_id=row['group_id'],
+            assigned_at=datetime.fromisoformat(row['assigned_at']) if row['assigned_at'] else None,
+            status=row['status'],
+            last_message_fetch=row['last_message_fetch'],
+            total_messages_fetched=row['total_messages_fetched']
+        )
+    
+    def _cache_get(self, cache: OrderedDict, key: str) -> Any:
+        """Return a copy of a cached lookup result, or None on a miss"""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is None:
+                return None
+            cache.move_to_end(key)
+        return copy.copy(value)
+    
+    def _cache_put(self, cache: OrderedDict, key: str, value: Any):
+        """Store a copy of a lookup result, evicting the least recently used entry when full"""
+        value = copy.copy(value)
+        with self._cache_lock:
+            cache[key] = value
+            if len(cache) > LOOKUP_CACHE_SIZE:
+                cache.popitem(last=False)
+    
+    def _cache_pop(self, cache: OrderedDict, *keys: str):
+        """Drop the entries of rows that a write may have changed"""
+        with self._cache_lock:
+            for key in keys:
+                cache.pop(key, None)
+    
+    def _cache_clear(self):
+        """Drop every cached account and group"""
+        with self._cache_lock:
+            self._account_cache.clear()
+            self._group_cache.clear()
     
     @contextmanager
     def get_connection(self):
-        """Get database connection with context manager"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        try:
-            yield conn
-        finally:
+        """Get this thread's persistent connection, opening it on first use.
+        The connection is in autocommit mode; group writes with transaction()."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.row_factory = sqlite3.Row  # Enable column access by name
+            conn.executescript(CONNECTION_PRAGMAS)
+        yield conn
+    
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed writes in one transaction, committed once on exit.
+        Nested calls join the outer transaction, so several writes share a single commit:
+            
+            with repo.transaction():
+                repo.create_assignment(assignment)
+                repo.create_assignment_history(history)
+        """
+        with self.get_connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                # A failed COMMIT leaves the transaction open, so it is rolled back too
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                # Rows read inside the rolled back transaction may no longer exist
+                self._cache_clear()
+                raise
+    
+    async def _run_blocking(self, func, *args):
+        """Run a blocking repository call on the database thread.
+        Such calls use that thread's connection, so they cannot join a transaction()
+        opened by the caller; awaiting one inside it would wait on the caller's write
+        lock until busy_timeout, so that raises RuntimeError instead."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and conn.in_transaction:
+            raise RuntimeError(
+                f"{func.__name__} cannot be awaited inside transaction(); call it after the transaction ends"
+            )
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    def _close_connection(self):
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
             conn.close()
+            self._local.conn = None
+    
+    def close(self):
+        """Close this thread's connection and the database thread's one; safe to call twice"""
+        if not self._closed:
+            self._closed = True
+            self._executor.submit(self._close_connection).result()
+            self._executor.shutdown()
+        self._close_connection()
     
     async def initialize(self):
         """Initialize database with schema"""
         self.logger.info("Initializing database...")
-        
+        await self._run_blocking(self._apply_schema)
+        self.logger.info("Database initialized successfully!")
+    
+    def _apply_schema(self):
+        """Switch the file to WAL and create missing tables and indexes"""
         with self.get_connection() as conn:
             with open('database/schema.sql', 'r') as f:
                 schema_sql = f.read()
             
-            conn.executescript(schema_sql)
-            conn.commit()
-        
-        self.logger.info("Database initialized successfully!")
+            conn.executescript(DATABASE_PRAGMAS)
+            
+            id_types = [row['type'] for row in conn.execute("PRAGMA table_info(messages)") if row['name'] == 'id']
+            if id_types and id_types[0].upper() != 'INTEGER':
+                self._migrate_messages_to_integer_ids(conn, schema_sql)
+            else:
+                conn.executescript(schema_sql)
+    
+    def _migrate_messages_to_integer_ids(self, conn: sqlite3.Connection, schema_sql: str):
+        """Recreate a TEXT-keyed messages table from schema.sql and copy its rows, all in one transaction"""
+        self.logger.info("Migrating messages table to integer IDs...")
+        # The renamed table keeps its indexes, whose names the new table needs
+        index_names = [row['name'] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'messages' AND sql IS NOT NULL"
+        )]
+        script = "\n".join([
+            "BEGIN IMMEDIATE;",
+            "ALTER TABLE messages RENAME TO messages_text_ids;",
+            *(f"DROP INDEX {name};" for name in index_names),
+            schema_sql,
+            _SQL_COPY_TEXT_ID_MESSAGES,
+            "COMMIT;"
+        ])
+        try:
+            conn.executescript(script)
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
     
     # Account operations
     async def create_account(self, account_data: Dict[str, Any]) -> bool:
         """Create new account"""
+        return await self._run_blocking(self._create_account, account_data)
+    
+    def _create_account(self, account_data: Dict[str, Any]) -> bool:
         try:
-            with self.get_connection() as conn:
-                group_id = group_data.get("id", str(uuid.uuid4()))
+            with self.transaction() as conn:
                 conn.execute("""
                     INSERT INTO accounts (id, name, phone, api_id, api_hash, session_name, status)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -68,23 +311,25 @@ class DatabaseRepository:
                     account_data['session_name'],
                     'active'
                 ))
-                conn.commit()
+            self._cache_pop(self._account_cache, account_data['id'])
             return True
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error creating account: {e}")
             return False
     
     def get_account_by_id(self, account_id: str) -> Optional[Account]:
         """Get account by ID"""
+        account = self._cache_get(self._account_cache, account_id)
+        if account is not None:
+            return account
+        
         try:
             with self.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM accounts WHERE id = ?", (account_id,)
-                )
+                cursor = conn.execute(_SQL_GET_ACCOUNT, (account_id,))
                 row = cursor.fetchone()
                 
                 if row:
-                    return Account(
+                    account = Account(
                         id=row['id'],
                         name=row['name'],
                         phone=row['phone'],
@@ -95,8 +340,10 @@ class DatabaseRepository:
                         created_at=row['created_at'],
                         updated_at=row['updated_at']
                     )
+                    self._cache_put(self._account_cache, account_id, account)
+                    return account
                 return None
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error getting account {account_id}: {e}")
             return None
     
@@ -104,7 +351,7 @@ class DatabaseRepository:
         """Get all accounts"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.execute("SELECT * FROM accounts WHERE status = 'active'")
+                cursor = conn.execute(_SQL_ACTIVE_ACCOUNTS)
                 rows = cursor.fetchall()
                 
                 accounts = []
@@ -121,7 +368,7 @@ class DatabaseRepository:
                         updated_at=row['updated_at']
                     ))
                 return accounts
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error getting all accounts: {e}")
             return []
     
@@ -131,21 +378,21 @@ class DatabaseRepository:
             with self.get_connection() as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM accounts WHERE status = 'active'")
                 return cursor.fetchone()[0]
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error counting accounts: {e}")
             return 0
     
     # Group operations
-    async def create_group(self, group_data: Dict[str, Any]) -> str:
-        """Create new group"""
+    async def create_group(self, group_data: Dict[str, Any]) -> Optional[str]:
+        """Create new group and return its ID"""
+        return await self._run_blocking(self._create_group, group_data)
+    
+    def _create_group(self, group_data: Dict[str, Any]) -> Optional[str]:
+        group_id = group_data.get("id", str(uuid.uuid4()))
         try:
-            with self.get_connection() as conn:
-                group_id = group_data.get("id", str(uuid.uuid4()))
-                conn.execute("""
-                    INSERT INTO groups (id, name, link, category, priority, credibility_score, total_members)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    group_data['id'],
+            with self.transaction() as conn:
+                conn.execute(_SQL_INSERT_GROUP, (
+                    group_id,
                     group_data['name'],
                     group_data['link'],
                     group_data['category'],
@@ -153,35 +400,58 @@ class DatabaseRepository:
                     group_data.get('credibility_score', 0.0),
                     group_data.get('total_members', 0)
                 ))
-                conn.commit()
-            return True
-        except Exception as e:
+            self._cache_pop(self._group_cache, group_id)
+            return group_id
+        except sqlite3.Error as e:
             self.logger.error(f"Error creating group: {e}")
+            return None
+    
+    async def create_groups_bulk(self, groups_data: List[Dict[str, Any]]) -> bool:
+        """Create groups in one transaction, skipping links that are already stored"""
+        return await self._run_blocking(self._create_groups_bulk, groups_data)
+    
+    def _create_groups_bulk(self, groups_data: List[Dict[str, Any]]) -> bool:
+        if not groups_data:
+            return True
+        
+        group_ids = [group_data.get("id", str(uuid.uuid4())) for group_data in groups_data]
+        try:
+            with self.transaction() as conn:
+                conn.executemany(_SQL_INSERT_GROUP_IF_NEW, [
+                    (
+                        group_id,
+                        group_data['name'],
+                        group_data['link'],
+                        group_data['category'],
+                        group_data['priority'],
+                        group_data.get('credibility_score', 0.0),
+                        group_data.get('total_members', 0)
+                    )
+                    for group_id, group_data in zip(group_ids, groups_data)
+                ])
+            self._cache_pop(self._group_cache, *group_ids)
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Error creating groups: {e}")
             return False
     
     def get_group_by_id(self, group_id: str) -> Optional[Group]:
         """Get group by ID"""
+        group = self._cache_get(self._group_cache, group_id)
+        if group is not None:
+            return group
+        
         try:
             with self.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM groups WHERE id = ?", (group_id,)
-                )
+                cursor = conn.execute(_SQL_GET_GROUP, (group_id,))
                 row = cursor.fetchone()
                 
                 if row:
-                    return Group(
-                        id=row['id'],
-                        name=row['name'],
-                        link=row['link'],
-                        category=row['category'],
-                        priority=row['priority'],
-                        credibility_score=row['credibility_score'],
-                        total_members=row['total_members'],
-                        created_at=row['created_at'],
-                        updated_at=row['updated_at']
-                    )
+                    group = self._group_from_row(row)
+                    self._cache_put(self._group_cache, group_id, group)
+                    return group
                 return None
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error getting group {group_id}: {e}")
             return None
     
@@ -189,81 +459,96 @@ class DatabaseRepository:
         """Get all groups"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.execute("SELECT * FROM groups")
+                cursor = conn.execute(_SQL_ALL_GROUPS)
                 rows = cursor.fetchall()
                 
-                groups = []
-                for row in rows:
-                    groups.append(Group(
-                        id=row['id'],
-                        name=row['name'],
-                        link=row['link'],
-                        category=row['category'],
-                        priority=row['priority'],
-                        credibility_score=row['credibility_score'],
-                        total_members=row['total_members'],
-                        created_at=row['created_at'],
-                        updated_at=row['updated_at']
-                    ))
-                return groups
-        except Exception as e:
+                return [self._group_from_row(row) for row in rows]
+        except sqlite3.Error as e:
             self.logger.error(f"Error getting all groups: {e}")
             return []
     
+    def get_groups_by_priority(self, priority: str) -> List[Group]:
+        """Get groups with the given priority"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.execute(_SQL_GROUPS_BY_PRIORITY, (priority,))
+                return [self._group_from_row(row) for row in cursor]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting groups by priority: {e}")
+            return []
+    
+    def get_groups_by_category(self, category: str) -> List[Group]:
+        """Get groups in the given category"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.execute(_SQL_GROUPS_BY_CATEGORY, (category,))
+                return [self._group_from_row(row) for row in cursor]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting groups by category: {e}")
+            return []
+    
+    def get_unassigned_groups(self) -> List[Group]:
+        """Get groups that have no active assignment"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.execute(_SQL_UNASSIGNED_GROUPS)
+                return [self._group_from_row(row) for row in cursor]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting unassigned groups: {e}")
+            return []
+    
+    def group_link_exists(self, link: str) -> bool:
+        """Check if a group with this link is stored"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.execute("SELECT 1 FROM groups WHERE link = ?", (link,))
+                return cursor.fetchone() is not None
+        except sqlite3.Error as e:
+            self.logger.error(f"Error finding group {link}: {e}")
+            return False
+    
     def count_groups(self) -> int:
         """Count total groups"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM groups")
                 return cursor.fetchone()[0]
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error counting groups: {e}")
             return 0
     
     # Assignment operations
-    def create_assignment(self, assignment: Assignment) -> bool:
-        """Create new assignment"""
+    def create_assignment(self, assignment: Assignment) -> Optional[Assignment]:
+        """Create assignment, or set the status of the existing one for the same account and group.
+        assigned_at is set by the database, in local time. Returns the written assignment, whose ID
+        differs from assignment.id if an existing one changed status, or None if the existing one
+        already had that status. Database errors are logged and re-raised so the caller's
+        transaction() rolls back."""
         try:
-            with self.get_connection() as conn:
-                group_id = group_data.get("id", str(uuid.uuid4()))
-                conn.execute("""
-                    INSERT INTO persistent_assignments (id, account_id, group_id, assigned_at, status)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
+            with self.transaction() as conn:
+                cursor = conn.execute(_SQL_UPSERT_ASSIGNMENT, (
                     assignment.id,
                     assignment.account_id,
                     assignment.group_id,
-                    assignment.assigned_at,
                     assignment.status
                 ))
-                conn.commit()
-            return True
-        except Exception as e:
+                row = cursor.fetchone()
+                return self._assignment_from_row(row) if row else None
+        except sqlite3.Error as e:
             self.logger.error(f"Error creating assignment: {e}")
-            return False
+            raise
     
     def get_assignment(self, account_id: str, group_id: str) -> Optional[Assignment]:
         """Get assignment by account and group"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM persistent_assignments WHERE account_id = ? AND group_id = ?",
-                    (account_id, group_id)
-                )
+                cursor = conn.execute(_SQL_GET_ASSIGNMENT, (account_id, group_id))
                 row = cursor.fetchone()
                 
                 if row:
-                    return Assignment(
-                        id=row['id'],
-                        account_id=row['account_id'],
-                        group_id=row['group_id'],
-                        assigned_at=row['assigned_at'],
-                        status=row['status'],
-                        last_message_fetch=row['last_message_fetch'],
-                        total_messages_fetched=row['total_messages_fetched']
-                    )
+                    return self._assignment_from_row(row)
                 return None
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error getting assignment: {e}")
             return None
     
@@ -271,25 +556,11 @@ class DatabaseRepository:
         """Get active assignments for account"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM persistent_assignments WHERE account_id = ? AND status = 'active'",
-                    (account_id,)
-                )
+                cursor = conn.execute(_SQL_ACTIVE_ASSIGNMENTS_BY_ACCOUNT, (account_id,))
                 rows = cursor.fetchall()
                 
-                assignments = []
-                for row in rows:
-                    assignments.append(Assignment(
-                        id=row['id'],
-                        account_id=row['account_id'],
-                        group_id=row['group_id'],
-                        assigned_at=row['assigned_at'],
-                        status=row['status'],
-                        last_message_fetch=row['last_message_fetch'],
-                        total_messages_fetched=row['total_messages_fetched']
-                    ))
-                return assignments
-        except Exception as e:
+                return [self._assignment_from_row(row) for row in rows]
+        except sqlite3.Error as e:
             self.logger.error(f"Error getting active assignments: {e}")
             return []
     
@@ -297,38 +568,26 @@ class DatabaseRepository:
         """Get active assignment for group"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM persistent_assignments WHERE group_id = ? AND status = 'active'",
-                    (group_id,)
-                )
+                cursor = conn.execute(_SQL_ACTIVE_ASSIGNMENT_BY_GROUP, (group_id,))
                 row = cursor.fetchone()
                 
                 if row:
-                    return Assignment(
-                        id=row['id'],
-                        account_id=row['account_id'],
-                        group_id=row['group_id'],
-                        assigned_at=row['assigned_at'],
-                        status=row['status'],
-                        last_message_fetch=row['last_message_fetch'],
-                        total_messages_fetched=row['total_messages_fetched']
-                    )
+                    return self._assignment_from_row(row)
                 return None
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error getting active assignment: {e}")
             return None
     
     def update_assignment_status(self, account_id: str, group_id: str, status: str) -> bool:
         """Update assignment status"""
         try:
-            with self.get_connection() as conn:
+            with self.transaction() as conn:
                 conn.execute(
-                    "UPDATE persistent_assignments SET status = ?, updated_at = ? WHERE account_id = ? AND group_id = ?",
-                    (status, datetime.now(), account_id, group_id)
+                    "UPDATE persistent_assignments SET status = ? WHERE account_id = ? AND group_id = ?",
+                    (status, account_id, group_id)
                 )
-                conn.commit()
             return True
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error updating assignment status: {e}")
             return False
     
@@ -340,7 +599,7 @@ class DatabaseRepository:
                     "SELECT group_id FROM persistent_assignments WHERE status = 'active'"
                 )
                 return [row[0] for row in cursor.fetchall()]
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error getting assigned group IDs: {e}")
             return []
     
@@ -350,43 +609,52 @@ class DatabaseRepository:
             with self.get_connection() as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM persistent_assignments WHERE status = 'active'")
                 return cursor.fetchone()[0]
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error counting active assignments: {e}")
             return 0
     
     # Assignment history operations
     def create_assignment_history(self, history: AssignmentHistory) -> bool:
-        """Create assignment history record"""
+        """Create assignment history record, timestamped by the database"""
         try:
-            with self.get_connection() as conn:
-                group_id = group_data.get("id", str(uuid.uuid4()))
-                conn.execute("""
-                    INSERT INTO assignment_history (id, account_id, group_id, action, timestamp, reason)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
+            with self.transaction() as conn:
+                conn.execute(_SQL_INSERT_ASSIGNMENT_HISTORY, (
                     history.id,
                     history.account_id,
                     history.group_id,
                     history.action,
-                    history.timestamp,
                     history.reason
                 ))
-                conn.commit()
             return True
-        except Exception as e:
+        except sqlite3.Error as e:
+            self.logger.error(f"Error creating assignment history: {e}")
+            return False
+    
+    def create_assignment_history_bulk(self, histories: List[AssignmentHistory]) -> bool:
+        """Create assignment history records in one transaction"""
+        if not histories:
+            return True
+        
+        try:
+            with self.transaction() as conn:
+                conn.executemany(_SQL_INSERT_ASSIGNMENT_HISTORY, [
+                    (history.id, history.account_id, history.group_id, history.action, history.reason)
+                    for history in histories
+                ])
+            return True
+        except sqlite3.Error as e:
             self.logger.error(f"Error creating assignment history: {e}")
             return False
     
     # Message operations
     async def store_message(self, message: Message, account_id: str, group_id: str) -> bool:
-        """Store message"""
+        """Store message, setting message.id to the new row ID when it has none"""
+        return await self._run_blocking(self._store_message, message, account_id, group_id)
+    
+    def _store_message(self, message: Message, account_id: str, group_id: str) -> bool:
         try:
-            with self.get_connection() as conn:
-                group_id = group_data.get("id", str(uuid.uuid4()))
-                conn.execute("""
-                    INSERT INTO messages (id, group_id, account_id, message_text, timestamp, is_job_message, job_score)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
+            with self.transaction() as conn:
+                cursor = conn.execute(_SQL_INSERT_MESSAGE, (
                     message.id,
                     group_id,
                     account_id,
@@ -395,14 +663,45 @@ class DatabaseRepository:
                     message.is_job_message,
                     message.job_score
                 ))
-                conn.commit()
+            if message.id is None:
+                message.id = cursor.lastrowid
             return True
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error storing message: {e}")
             return False
     
+    async def store_messages_bulk(self, messages: List[Message], account_id: str, group_id: str) -> bool:
+        """Store messages fetched from one group in one transaction"""
+        return await self._run_blocking(self._store_messages_bulk, messages, account_id, group_id)
+    
+    def _store_messages_bulk(self, messages: List[Message], account_id: str, group_id: str) -> bool:
+        if not messages:
+            return True
+        
+        try:
+            with self.transaction() as conn:
+                conn.executemany(_SQL_INSERT_MESSAGE, [
+                    (
+                        message.id,
+                        group_id,
+                        account_id,
+                        message.message_text,
+                        message.timestamp,
+                        message.is_job_message,
+                        message.job_score
+                    )
+                    for message in messages
+                ])
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Error storing messages: {e}")
+            return False
+    
     async def get_message_count_by_account(self, account_id: str) -> int:
         """Get message count for account"""
+        return await self._run_blocking(self._get_message_count_by_account, account_id)
+    
+    def _get_message_count_by_account(self, account_id: str) -> int:
         try:
             with self.get_connection() as conn:
                 cursor = conn.execute(
@@ -410,6 +709,6 @@ class DatabaseRepository:
                     (account_id,)
                 )
                 return cursor.fetchone()[0]
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Error getting message count: {e}")
             return 0
@@ -52,9 +52,9 @@ CREATE TABLE IF NOT EXISTS assignment_history (
     FOREIGN KEY (group_id) REFERENCES groups(id)
 );
 
--- Messages table
+-- Messages table (integer rowid keys: nothing references messages by ID)
 CREATE TABLE IF NOT EXISTS messages (
-    id TEXT PRIMARY KEY,
+    id INTEGER PRIMARY KEY,
     group_id TEXT NOT NULL,
     account_id TEXT NOT NULL,
     message_text TEXT NOT NULL,
@@ -66,9 +66,11 @@ CREATE TABLE IF NOT EXISTS messages (
 );
 
 -- Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_persistent_assignments_account ON persistent_assignments(account_id);
-CREATE INDEX IF NOT EXISTS idx_persistent_assignments_group ON persistent_assignments(group_id);
-CREATE INDEX IF NOT EXISTS idx_persistent_assignments_status ON persistent_assignments(status);
+-- count_accounts() and get_all_accounts() only read active accounts
+CREATE INDEX IF NOT EXISTS idx_accounts_active ON accounts(id) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_persistent_assignments_account_status ON persistent_assignments(account_id, status);
+-- Only active assignments are looked up by group, counted or excluded from available groups
+CREATE INDEX IF NOT EXISTS idx_persistent_assignments_active_group ON persistent_assignments(group_id) WHERE status = 'active';
 CREATE INDEX IF NOT EXISTS idx_assignment_history_account ON assignment_history(account_id);
 CREATE INDEX IF NOT EXISTS idx_assignment_history_group ON assignment_history(group_id);
 CREATE INDEX IF NOT EXISTS idx_assignment_history_timestamp ON assignment_history(timestamp);
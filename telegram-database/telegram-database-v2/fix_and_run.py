@@ -6,7 +6,6 @@ import asyncio
 import logging
 import sys
 import os
-import uuid
 from datetime import datetime
 from typing import List, Dict, Any
 
@@ -59,14 +58,8 @@ class SimpleTelegramJobScraper:
             
             self.logger.info(f"📁 Loaded {len(groups_data)} groups from file")
             
-            # Load groups into database
-            for group_data in groups_data:
-                # Generate ID if not present
-                if 'id' not in group_data:
-                    group_data['id'] = str(uuid.uuid4())
-                
-                # Create group in database
-                await self.db.create_group(group_data)
+            # Load groups into database, generating IDs where missing
+            await self.db.create_groups_bulk(groups_data)
             
             self.logger.info("✅ All groups loaded into database")
             
@@ -125,25 +118,25 @@ class SimpleTelegramJobScraper:
                 )
                 
                 # Store messages
+                from models.message import Message
                 job_messages = []
+                batch = []
                 for message_data in messages:
                     # Create message object
-                    from models.message import Message
-                    message = Message(
-                        id=str(uuid.uuid4()),
+                    batch.append(Message(
                         message_text=message_data['text'],
                         timestamp=message_data['timestamp'],
                         is_job_message=message_data['is_job_message'],
                         job_score=message_data['job_score']
-                    )
-                    
-                    # Store in database
-                    await self.db.store_message(message, account.id, group.id)
+                    ))
                     
                     # Collect job messages
                     if message_data['is_job_message']:
                         job_messages.append(message_data['text'])
                 
+                # Store the whole group's messages in one transaction
+                await self.db.store_messages_bulk(batch, account.id, group.id)
+                
                 self.logger.info(f"✅ Joined {group.name} and fetched {len(messages)} messages")
                 self.logger.info(f"📋 Found {len(job_messages)} job messages in {group.name}")
                 
@@ -19,6 +19,7 @@ from core.human_behavior_simulator import HumanBehaviorSimulator
 from services.telegram_service import TelegramService
 from services.group_manager import GroupManager
 from database.repository import DatabaseRepository
+from models.message import Message
 
 # Configure logging
 logging.basicConfig(
@@ -155,9 +156,16 @@ class TelegramJobScraperV2:
                 account, group.link, limit=settings.MESSAGE_FETCH_LIMIT
             )
             
-            # Store messages
-            for message in messages:
-                await self.db.store_message(message, account.id, group.id)
+            # Store the whole group's messages in one transaction
+            await self.db.store_messages_bulk([
+                Message(
+                    message_text=message_data['text'],
+                    timestamp=message_data['timestamp'],
+                    is_job_message=message_data['is_job_message'],
+                    job_score=message_data['job_score']
+                )
+                for message_data in messages
+            ], account.id, group.id)
             
             self.logger.info(f"✅ Fetched {len(messages)} messages from {group.name}")
             
@@ -213,6 +221,8 @@ class TelegramJobScraperV2:
         except Exception as e:
             self.logger.error(f"System error: {e}")
             raise
+        finally:
+            self.db.close()
 
 async def main():
     """Main function"""
@@ -8,11 +8,11 @@ from typing import Optional
 @dataclass
 class Message:
     """Message data model"""
-    id: str
     message_text: str
     timestamp: datetime
     is_job_message: bool = False
     job_score: float = 0.0
+    id: Optional[int] = None  # Assigned by the database when stored
     
     def __post_init__(self):
         if self.timestamp is None:
@@ -36,19 +36,9 @@ class GroupManager:
     async def _load_groups_to_database(self):
         """Load groups into database"""
         try:
-            for group_data in self.universal_groups:
-                # Check if group already exists
-                existing_group = self._find_group_by_link(group_data['link'])
-                
-                if not existing_group:
-                    # Create group in database
-                    group_id = await self.db.create_group(group_data)
-                    if group_id:
-                        self.logger.debug(f"Created group in database: {group_data['name']}")
-                else:
-                    self.logger.debug(f"Group already exists: {group_data['name']}")
-            
-            self.logger.info("✅ All groups loaded into database")
+            # Groups whose link is already stored are skipped by the bulk insert
+            if await self.db.create_groups_bulk(self.universal_groups):
+                self.logger.info("✅ All groups loaded into database")
             
         except Exception as e:
             self.logger.error(f"Error loading groups to database: {e}")
@@ -57,8 +47,7 @@ class GroupManager:
     def _find_group_by_link(self, link: str) -> bool:
         """Check if group exists in database by link"""
         try:
-            groups = self.db.get_all_groups()
-            return any(group.link == link for group in groups)
+            return self.db.group_link_exists(link)
         except Exception as e:
             self.logger.error(f"Error finding group: {e}")
             return False
@@ -66,8 +55,7 @@ class GroupManager:
     def get_groups_by_priority(self, priority: str) -> List[Group]:
         """Get groups by priority"""
         try:
-            groups = self.db.get_all_groups()
-            return [group for group in groups if group.priority == priority]
+            return self.db.get_groups_by_priority(priority)
         except Exception as e:
             self.logger.error(f"Error getting groups by priority: {e}")
             return []
@@ -75,8 +63,7 @@ class GroupManager:
     def get_groups_by_category(self, category: str) -> List[Group]:
         """Get groups by category"""
         try:
-            groups = self.db.get_all_groups()
-            return [group for group in groups if group.category == category]
+            return self.db.get_groups_by_category(category)
         except Exception as e:
             self.logger.error(f"Error getting groups by category: {e}")
             return []
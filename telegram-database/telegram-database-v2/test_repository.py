@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for DatabaseRepository against a temporary SQLite database
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.repository import DatabaseRepository
+from core.assignment_engine import PersistentAssignmentEngine
+from models.assignment import Assignment
+from models.message import Message
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """An initialized repository on a fresh database file; schema.sql is read relative to this directory"""
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+    repository = DatabaseRepository(f"sqlite:///{tmp_path / 'test.db'}")
+    asyncio.run(repository.initialize())
+    yield repository
+    repository.close()
+
+PYTHON_JOBS = {'name': 'Python Jobs', 'link': 'https://t.me/pyjobs', 'category': 'programming', 'priority': 'high'}
+JAVA_JOBS = {'name': 'Java Jobs', 'link': 'https://t.me/javajobs', 'category': 'programming', 'priority': 'medium'}
+
+@pytest.fixture
+def engine(repo):
+    """An assignment engine writing to the temporary repository"""
+    assignment_engine = PersistentAssignmentEngine.__new__(PersistentAssignmentEngine)
+    assignment_engine.db = repo
+    assignment_engine.logger = logging.getLogger(__name__)
+    return assignment_engine
+
+def count_rows(repo, table):
+    with repo.get_connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+def test_transaction_rolls_back_on_error(repo):
+    with pytest.raises(RuntimeError):
+        with repo.transaction() as outer:
+            with repo.transaction() as inner:
+                assert inner is outer
+                repo._create_group(PYTHON_JOBS)
+            # Leaving the inner block must not commit
+            assert outer.in_transaction
+            raise RuntimeError("boom")
+    
+    assert count_rows(repo, 'groups') == 0
+
+def test_failed_commit_rolls_back(repo):
+    cached_group_id = repo._create_group(JAVA_JOBS)
+    assert repo.get_group_by_id(cached_group_id) is not None
+    
+    with repo.get_connection() as conn:
+        conn.executescript("""
+            PRAGMA foreign_keys = ON;
+            CREATE TABLE parent (id INTEGER PRIMARY KEY);
+            CREATE TABLE child (parent_id INTEGER REFERENCES parent (id) DEFERRABLE INITIALLY DEFERRED);
+        """)
+    
+    with pytest.raises(sqlite3.IntegrityError):
+        with repo.transaction() as conn:
+            repo._create_group(PYTHON_JOBS)
+            # Only checked at COMMIT, which therefore fails
+            conn.execute("INSERT INTO child (parent_id) VALUES (1)")
+    
+    with repo.get_connection() as conn:
+        assert not conn.in_transaction
+    assert count_rows(repo, 'groups') == 1
+    assert not repo._group_cache
+
+def test_initialize_migrates_text_message_ids(tmp_path, monkeypatch):
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+    db_path = tmp_path / 'old.db'
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE messages (
+            id TEXT PRIMARY KEY,
+            group_id TEXT NOT NULL,
+            account_id TEXT NOT NULL,
+            message_text TEXT NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            is_job_message BOOLEAN DEFAULT FALSE,
+            job_score REAL DEFAULT 0.0
+        );
+        CREATE INDEX idx_messages_group ON messages(group_id);
+        INSERT INTO messages VALUES ('b-uuid', 'g1', 'acc', 'first', '2025-01-01', 1, 0.9);
+        INSERT INTO messages VALUES ('a-uuid', 'g1', 'acc', 'second', '2025-01-02', 0, 0.0);
+    """)
+    conn.close()
+    
+    repository = DatabaseRepository(f"sqlite:///{db_path}")
+    try:
+        asyncio.run(repository.initialize())
+        asyncio.run(repository.store_messages_bulk([Message(message_text='third', timestamp='2025-01-03')], 'acc', 'g1'))
+        
+        with repository.get_connection() as conn:
+            id_type = [row['type'] for row in conn.execute("PRAGMA table_info(messages)") if row['name'] == 'id']
+            rows = conn.execute("SELECT id, message_text FROM messages ORDER BY id").fetchall()
+            indexes = {row['name'] for row in conn.execute("SELECT name FROM sqlite_master WHERE tbl_name = 'messages'")}
+        
+        assert id_type == ['INTEGER']
+        assert [tuple(row) for row in rows] == [(1, 'first'), (2, 'second'), (3, 'third')]
+        assert {'idx_messages_group', 'idx_messages_account', 'idx_messages_timestamp'} <= indexes
+        
+        # A second start finds the integer key and leaves the table alone
+        asyncio.run(repository.initialize())
+        assert count_rows(repository, 'messages') == 3
+    finally:
+        repository.close()
+
+def test_create_assignment_reactivates_left_assignment(repo):
+    group_id = repo._create_group(PYTHON_JOBS)
+    first = repo.create_assignment(Assignment(id='first', account_id='acc', group_id=group_id, assigned_at=None))
+    repo.update_assignment_status('acc', group_id, 'left')
+    
+    stored = repo.create_assignment(Assignment(id='second', account_id='acc', group_id=group_id, assigned_at=None))
+    
+    assert stored.id == first.id
+    assert stored.status == 'active'
+    assert count_rows(repo, 'persistent_assignments') == 1
+
+def test_engine_logs_reactivated_assignment(repo, engine):
+    group_id = repo._create_group(PYTHON_JOBS)
+    
+    assert engine.assign_group_to_account('acc', group_id)
+    assert engine.unassign_group_from_account('acc', group_id)
+    assert engine.assign_group_to_account('acc', group_id)
+    # Assigning an active pair again changes nothing
+    assert engine.assign_group_to_account('acc', group_id)
+    
+    with repo.get_connection() as conn:
+        history = conn.execute(
+            "SELECT action, reason FROM assignment_history WHERE account_id = 'acc' ORDER BY rowid"
+        ).fetchall()
+    assert [tuple(row) for row in history] == [
+        ('joined', 'Initial assignment'),
+        ('left', 'Manual unassignment'),
+        ('joined', 'Reactivated assignment'),
+    ]
+    assert repo.get_assignment('acc', group_id).status == 'active'
+
+def test_assignment_times_are_local(repo, engine):
+    group_id = repo._create_group(PYTHON_JOBS)
+    before = datetime.now().replace(microsecond=0)
+    
+    assert engine.assign_group_to_account('acc', group_id)
+    assignment = repo.get_assignment('acc', group_id)
+    with repo.get_connection() as conn:
+        history_time = conn.execute("SELECT timestamp FROM assignment_history").fetchone()[0]
+    
+    after = datetime.now()
+    assert isinstance(assignment.assigned_at, datetime)
+    assert before <= assignment.assigned_at <= after
+    assert before <= datetime.fromisoformat(history_time) <= after
+
+def test_group_cache_hands_out_copies(repo):
+    group_id = repo._create_group(PYTHON_JOBS)
+    
+    group = repo.get_group_by_id(group_id)
+    group.name = 'Changed by caller'
+    
+    assert repo.get_group_by_id(group_id).name == 'Python Jobs'
+    assert repo.get_group_by_id(group_id) is not repo.get_group_by_id(group_id)
+
+def test_async_call_inside_transaction_raises(repo):
+    async def create_inside_transaction():
+        with repo.transaction():
+            await repo.create_group(PYTHON_JOBS)
+    
+    with pytest.raises(RuntimeError):
+        asyncio.run(create_inside_transaction())
+    
+    assert count_rows(repo, 'groups') == 0
+
+def test_close_twice(repo):
+    repo.close()
+    repo.close()
+
+def test_create_assignment_returns_none_for_active_assignment(repo):
+    group_id = repo._create_group(PYTHON_JOBS)
+    repo.create_assignment(Assignment(id='first', account_id='acc', group_id=group_id, assigned_at=None))
+    
+    assert repo.create_assignment(Assignment(id='second', account_id='acc', group_id=group_id, assigned_at=None)) is None
+    assert repo.get_assignment('acc', group_id).id == 'first'
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for DatabaseManager against a temporary SQLite database
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database import DatabaseManager
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A DatabaseManager on a fresh database file; schema.sql is read relative to this directory"""
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+    manager = DatabaseManager(str(tmp_path / "test.db"))
+    yield manager
+    manager.close()
+
+def make_message(group_id, message_id, text="hello"):
+    return {
+        'group_id': group_id,
+        'message_id': message_id,
+        'sender_id': 'sender',
+        'sender_name': 'Sender',
+        'message_text': text,
+        'timestamp': '2025-01-01T00:00:00',
+        'fetched_by_account': 'account1'
+    }
+
+def count_messages(db):
+    return db.get_connection().execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+def test_insert_messages_bulk_resolves_ids_per_group(db):
+    row_ids = db.insert_messages_bulk([
+        make_message(1, '100'),
+        make_message(2, '100'),
+        make_message(2, '101', "We are hiring"),
+    ])
+    
+    assert set(row_ids) == {(1, '100'), (2, '100'), (2, '101')}
+    assert len(set(row_ids.values())) == 3
+    
+    stored = db.get_connection().execute(
+        "SELECT group_id, message_id, is_job_candidate FROM messages WHERE id = ?", (row_ids[(2, '101')],)
+    ).fetchone()
+    assert stored == (2, '101', 1)
+
+def test_insert_messages_bulk_returns_ids_of_already_stored_messages(db):
+    first = db.insert_messages_bulk([make_message(1, '100')])
+    second = db.insert_messages_bulk([make_message(1, '100'), make_message(1, '101')])
+    
+    assert second[(1, '100')] == first[(1, '100')]
+    assert count_messages(db) == 2
+
+def test_insert_messages_bulk_skips_messages_without_id(db):
+    row_ids = db.insert_messages_bulk([
+        make_message(1, None),
+        make_message(1, ''),
+        make_message(1, '100'),
+    ])
+    
+    assert list(row_ids) == [(1, '100')]
+    assert count_messages(db) == 1
+    assert db.insert_messages_bulk([make_message(1, None)]) == {}
+
+def test_insert_message_returns_row_id(db):
+    row_id = db.insert_message(make_message(1, 42))
+    
+    assert row_id == db.insert_message(make_message(1, 42))
+    assert row_id > 0
+
+def test_transaction_rolls_back_on_error(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.insert_message(make_message(1, '100'))
+            raise RuntimeError("boom")
+    
+    assert count_messages(db) == 0
+    assert not db.get_connection().in_transaction
+
+def test_nested_transaction_joins_outer_transaction(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction() as outer:
+            with db.transaction() as inner:
+                assert inner is outer
+                db.insert_message(make_message(1, '100'))
+            # Leaving the inner block must not commit
+            assert outer.in_transaction
+            raise RuntimeError("boom")
+    
+    assert count_messages(db) == 0
+
+def test_failed_commit_rolls_back_and_clears_city_cache(db):
+    conn = db.get_connection()
+    conn.executescript("""
+        PRAGMA foreign_keys = ON;
+        CREATE TABLE parent (id INTEGER PRIMARY KEY);
+        CREATE TABLE child (parent_id INTEGER REFERENCES parent (id) DEFERRABLE INITIALLY DEFERRED);
+    """)
+    
+    with pytest.raises(sqlite3.IntegrityError):
+        with db.transaction():
+            db.insert_city("Pune")
+            # Only checked at COMMIT, which therefore fails
+            conn.execute("INSERT INTO child (parent_id) VALUES (1)")
+    
+    assert not conn.in_transaction
+    assert db._city_ids == {}
+    assert conn.execute("SELECT COUNT(*) FROM cities").fetchone()[0] == 0